@@ -0,0 +1,62 @@
+"""
+Shared genai client and response builders for the tools.media_tools tests.
+
+Responses are plain-object trees (SimpleNamespace, with slotted classes
+for Imagen image leaves) shaped like what media_tools reads from the
+genai SDK, so building one is cheap and reading it never
+goes through MagicMock attribute machinery. They never create mocks, so
+they need no "mocks active" switch to be reused outside patched tests;
+only make_genai_client() builds a MagicMock.
+
+    from _mock_fixtures import make_imagen_response, make_nano_banana_response
+"""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+
+class _ImgBytes:
+    """Image payload of an Imagen generated image"""
+    __slots__ = ("image_bytes",)
+
+    def __init__(self, image_bytes):
+        self.image_bytes = image_bytes
+
+
+class _Img:
+    """Imagen generated-image leaf carrying raw bytes.
+
+    Slotted rather than SimpleNamespace: responses can carry many images
+    and these are built per call.
+    """
+    __slots__ = ("image",)
+
+    def __init__(self, image_bytes):
+        self.image = _ImgBytes(image_bytes)
+
+
+def _part(data, mime_type="image/png"):
+    """Nano Banana content part carrying inline image data"""
+    return SimpleNamespace(inline_data=SimpleNamespace(data=data, mime_type=mime_type))
+
+
+def make_imagen_response(n=1, image_bytes=b"fake_image_data"):
+    """generate_images response carrying n images (n=0 for an empty result)"""
+    return SimpleNamespace(generated_images=[_Img(image_bytes) for _ in range(n)])
+
+
+def make_nano_banana_response(data=b"edited", mime="image/png"):
+    """generate_content response with a single candidate holding one image part"""
+    return SimpleNamespace(candidates=[
+        SimpleNamespace(content=SimpleNamespace(parts=[_part(data, mime)]))
+    ])
+
+
+def make_genai_client():
+    """genai client mock limited to the models.generate_* calls media_tools makes.
+
+    Build it once per test class and reset_mock() between tests; any other
+    attribute raises AttributeError instead of spawning a child mock.
+    """
+    client = MagicMock(spec=['models'])
+    client.models = MagicMock(spec=['generate_images', 'generate_content', 'generate_videos'])
+    return client
@@ -2,9 +2,73 @@
 Global pytest configuration for test isolation and proper cleanup.
 """
 
+import os
 import sys
 import pytest
 from typing import Dict, Any
+from unittest.mock import MagicMock
+
+# Add python_service to path once for every test module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Mock firebase_admin once for the whole session, before any test module
+# imports code that pulls in firebase_admin (e.g. tools.media_tools).
+# This has to happen at conftest import time: session fixtures only run
+# after collection, when the test modules have already been imported.
+# Submodules are children of the one root mock, so `firebase_admin.storage`
+# and `from firebase_admin import storage` resolve to the same object.
+_firebase_admin = sys.modules.setdefault('firebase_admin', MagicMock())
+sys.modules.setdefault('firebase_admin.storage', _firebase_admin.storage)
+sys.modules.setdefault('firebase_admin.credentials', _firebase_admin.credentials)
+
+
+def pytest_configure(config):
+    """Register markers used by the suite so they work without pytest-xdist."""
+    config.addinivalue_line(
+        "markers",
+        "xdist_group(name): keep a test class on one worker under --dist loadgroup",
+    )
+
+
+# -------------------------------------------------------------------------
+# Shared tools.media_tools mocks
+# -------------------------------------------------------------------------
+# Targets are dotted strings so conftest does not import tools.media_tools
+# for test modules that never use these fixtures.
+
+@pytest.fixture
+def mock_genai(monkeypatch):
+    """Replace the module-level genai client with a MagicMock"""
+    mock = MagicMock()
+    monkeypatch.setattr('tools.media_tools.genai_client', mock)
+    return mock
+
+
+@pytest.fixture
+def mock_upload(monkeypatch):
+    """Replace upload_to_storage with a MagicMock"""
+    mock = MagicMock()
+    monkeypatch.setattr('tools.media_tools.upload_to_storage', mock)
+    return mock
+
+
+@pytest.fixture(scope="module")
+def _module_requests():
+    """Fake requests module built once per module"""
+    return MagicMock()
+
+
+@pytest.fixture
+def fake_requests(monkeypatch, _module_requests):
+    """Install the module-wide fake requests, with state cleared for each test.
+
+    The patch itself is function-scoped so no test leaves media_tools
+    pointing at the fake, which keeps test modules safe to run under
+    pytest-xdist's default load distribution.
+    """
+    _module_requests.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr('tools.media_tools.requests', _module_requests)
+    return _module_requests
 
 
 @pytest.fixture(autouse=True)
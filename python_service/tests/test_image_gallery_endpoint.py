@@ -13,26 +13,112 @@ These tests verify:
 - Response transformation
 """
 import unittest
-from unittest.mock import MagicMock, patch
-import sys
-import os
+from unittest.mock import patch
+import pytest
 import base64
-
-# Add python_service to path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-# Mock firebase_admin before importing
-sys.modules['firebase_admin'] = MagicMock()
-sys.modules['firebase_admin.storage'] = MagicMock()
-sys.modules['firebase_admin.credentials'] = MagicMock()
-
-from tools.media_tools import nano_banana
+from functools import lru_cache
+from types import SimpleNamespace
+
+import tools.media_tools as mt
+from tools.media_tools import generate_image, nano_banana
+from _mock_fixtures import make_imagen_response, make_nano_banana_response
+
+# Common aspect ratios used in Image Gallery
+GALLERY_ASPECT_RATIOS = (
+    '1:1',    # Square (default)
+    '16:9',   # Landscape
+    '9:16',   # Portrait/Story
+    '4:3',    # Standard
+    '3:2',    # Photo
+)
+
+# Storage URLs returned by the mocked upload_to_storage
+_URL_IMAGE = "https://storage.example.com/image.png"
+_URL_EDITED = "https://storage.example.com/edited.png"
+_URL_GENERATED = "https://storage.example.com/generated.png"
+
+# Fields every image response must carry for the frontend
+_REQUIRED_FIELDS = frozenset({'status', 'message', 'format', 'prompt'})
+# Singular and array URL fields returned when upload succeeds
+_URL_FIELDS = frozenset({'image_url', 'image_urls'})
+
+# Base64 of the edited image bytes returned by the mock edit response
+_EXPECTED_EDITED_B64 = base64.b64encode(b"edited_image_data").decode('utf-8')
+
+# Base64 images as sent by the Image Gallery
+_B64_GALLERY = base64.b64encode(b"gallery_image").decode('utf-8')
+_B64_CHAR_SHEET = base64.b64encode(b"character_sheet").decode('utf-8')
+_B64_ORIGINAL = base64.b64encode(b"original_image").decode('utf-8')
+_B64_MASK = base64.b64encode(b"mask_image").decode('utf-8')
+_B64_MAIN_SCENE = base64.b64encode(b"main_scene").decode('utf-8')
+# Multi-image inputs are comma-separated as per ADK format
+_B64_COMPOSE_IMAGES = ",".join(
+    base64.b64encode(img).decode('utf-8') for img in (b"background", b"product", b"logo")
+)
+_B64_OVERLAYS = ",".join(
+    base64.b64encode(img).decode('utf-8') for img in (b"overlay1", b"overlay2")
+)
+
+# nano_banana requests used by the Image Gallery that must all succeed
+GALLERY_REQUEST_CASES = (
+    # Basic image editing
+    ("edit_from_gallery", dict(
+        prompt="Make this image brighter and add more contrast",
+        image_url=_B64_GALLERY,
+        mode="edit",
+    )),
+    # Character-consistent generation (used for campaigns)
+    ("character_consistent_generation", dict(
+        prompt="Generate the character in a beach scene",
+        reference_images=_B64_CHAR_SHEET,
+        aspect_ratio="16:9",
+        person_generation="allow_all",
+    )),
+    # Multi-image composition
+    ("compose_multiple_images", dict(
+        prompt="Compose these elements into a product advertisement",
+        reference_images=_B64_COMPOSE_IMAGES,
+        mode="compose",
+    )),
+    ("compose_with_main_image_and_references", dict(
+        prompt="Add these elements to the main scene",
+        image_url=_B64_MAIN_SCENE,
+        reference_images=_B64_OVERLAYS,
+        mode="compose",
+    )),
+    # Mask-based inpainting
+    ("mask_inpainting", dict(
+        prompt="Replace the masked area with a tree",
+        image_url=_B64_ORIGINAL,
+        mask_url=_B64_MASK,
+    )),
+    # Person generation control
+    ("person_generation_allow_all", dict(
+        prompt="A group of people",
+        person_generation="allow_all",
+    )),
+    ("person_generation_allow_adult", dict(
+        prompt="Professional portrait",
+        person_generation="allow_adult",
+    )),
+)
+
+
+@lru_cache(maxsize=8)
+def _build_generate_response(num_images):
+    """Shared read-only Imagen generate_images response, one per image count"""
+    return make_imagen_response(num_images, b"generated")
+
+
+# Read-only Nano Banana response shared by the tests that edit successfully
+_EDIT_RESPONSE = make_nano_banana_response(b"edited_image_data")
 
 
 # =============================================================================
 # IMAGE GALLERY - NANO BANANA ENDPOINT TESTS
 # =============================================================================
 
+@pytest.mark.xdist_group(name="gallery_nano_banana")
 class TestImageGalleryNanoBananaEndpoint(unittest.TestCase):
     """
     Test the Nano Banana endpoint behavior for Image Gallery.
@@ -43,56 +129,53 @@ class TestImageGalleryNanoBananaEndpoint(unittest.TestCase):
     - Multi-image composition
     """
 
-    def _setup_mock_edit_response(self, mock_genai):
+    def _patch(self, name):
+        """Patch media_tools.<name> for this test only and return the mock"""
+        patcher = patch.object(mt, name)
+        mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        return mock
+
+    def setUp(self):
+        self.mock_genai = self._patch('genai_client')
+        self.mock_upload = self._patch('upload_to_storage')
+        self.mock_download = self._patch('download_from_firebase_storage')
+        self.mock_is_firebase = self._patch('is_firebase_storage_url')
+
+        self.mock_upload.return_value = _URL_IMAGE
+
+    def _setup_mock_edit_response(self):
         """Helper to set up standard mock response"""
-        mock_response = MagicMock()
-        mock_candidate = MagicMock()
-        mock_part = MagicMock()
-        mock_part.inline_data = MagicMock()
-        mock_part.inline_data.data = b"edited_image_data"
-        mock_part.inline_data.mime_type = "image/png"
-        mock_candidate.content.parts = [mock_part]
-        mock_response.candidates = [mock_candidate]
-        mock_genai.models.generate_content.return_value = mock_response
+        self.mock_genai.models.generate_content.return_value = _EDIT_RESPONSE
 
     # -------------------------------------------------------------------------
-    # Basic Image Editing (Image Gallery Edit Feature)
+    # Gallery Requests (Editing, Character Consistency, Composition, Masks)
     # -------------------------------------------------------------------------
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_edit_image_from_gallery(self, mock_upload, mock_genai):
-        """Test editing an image from the gallery"""
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-        self._setup_mock_edit_response(mock_genai)
+    def test_gallery_requests(self):
+        """Test each request shape the Image Gallery sends returns a success"""
+        self._setup_mock_edit_response()
 
-        # Simulate gallery sending base64 image
-        image_data = base64.b64encode(b"gallery_image").decode('utf-8')
+        for name, kwargs in GALLERY_REQUEST_CASES:
+            with self.subTest(case=name):
+                result = nano_banana(**kwargs)
 
-        result = nano_banana(
-            prompt="Make this image brighter and add more contrast",
-            image_url=image_data,
-            mode="edit"
-        )
+                self.assertEqual(result['status'], 'success')
+                # Verify the result format matches frontend expectations
+                self.assertEqual(result['image_url'], result['image_urls'][0])
 
-        self.assertEqual(result['status'], 'success')
-        self.assertIn('image_url', result)
-        self.assertIn('image_urls', result)
-        # Verify the result format matches frontend expectations
-        self.assertEqual(result['image_url'], result['image_urls'][0])
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    @patch('tools.media_tools.download_from_firebase_storage')
-    @patch('tools.media_tools.is_firebase_storage_url')
-    def test_edit_image_from_firebase_url(self, mock_is_firebase, mock_download, mock_upload, mock_genai):
+    # -------------------------------------------------------------------------
+    # Image Editing from Firebase Storage
+    # -------------------------------------------------------------------------
+
+    def test_edit_image_from_firebase_url(self):
         """Test editing image using Firebase Storage URL"""
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-        self._setup_mock_edit_response(mock_genai)
+        self.mock_upload.return_value = _URL_EDITED
+        self._setup_mock_edit_response()
 
         # Mock Firebase Storage URL detection and download
-        mock_is_firebase.return_value = True
-        mock_download.return_value = (b"downloaded_image", "image/png")
+        self.mock_is_firebase.return_value = True
+        self.mock_download.return_value = (b"downloaded_image", "image/png")
 
         result = nano_banana(
             prompt="Remove the background",
@@ -100,38 +183,16 @@ class TestImageGalleryNanoBananaEndpoint(unittest.TestCase):
         )
 
         self.assertEqual(result['status'], 'success')
-        mock_download.assert_called_once()
+        self.mock_download.assert_called_once()
 
     # -------------------------------------------------------------------------
     # Character-Consistent Image Generation
     # -------------------------------------------------------------------------
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_character_consistent_generation(self, mock_upload, mock_genai):
-        """Test character-consistent image generation (used for campaigns)"""
-        mock_upload.return_value = "https://storage.example.com/generated.png"
-        self._setup_mock_edit_response(mock_genai)
-
-        # Character sheet as reference
-        char_sheet = base64.b64encode(b"character_sheet").decode('utf-8')
-
-        result = nano_banana(
-            prompt="Generate the character in a beach scene",
-            reference_images=char_sheet,
-            aspect_ratio="16:9",
-            person_generation="allow_all"
-        )
-
-        self.assertEqual(result['status'], 'success')
-        self.assertIn('image_url', result)
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_multiple_character_references(self, mock_upload, mock_genai):
+    def test_multiple_character_references(self):
         """Test generation with multiple character reference images"""
-        mock_upload.return_value = "https://storage.example.com/generated.png"
-        self._setup_mock_edit_response(mock_genai)
+        self.mock_upload.return_value = _URL_GENERATED
+        self._setup_mock_edit_response()
 
         # Multiple character references (comma-separated as per ADK format)
         refs = ",".join([
@@ -149,125 +210,39 @@ class TestImageGalleryNanoBananaEndpoint(unittest.TestCase):
         self.assertEqual(result['status'], 'success')
 
         # Verify multiple image parts were passed
-        call_args = mock_genai.models.generate_content.call_args
+        call_args = self.mock_genai.models.generate_content.call_args
         contents = call_args[1]['contents']
         # Should have reference images + prompt text
         self.assertGreater(len(contents), 1)
 
-    # -------------------------------------------------------------------------
-    # Multi-Image Composition
-    # -------------------------------------------------------------------------
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_compose_multiple_images(self, mock_upload, mock_genai):
-        """Test composing multiple images together"""
-        mock_upload.return_value = "https://storage.example.com/composed.png"
-        self._setup_mock_edit_response(mock_genai)
-
-        # Multiple images to compose
-        images = ",".join([
-            base64.b64encode(b"background").decode('utf-8'),
-            base64.b64encode(b"product").decode('utf-8'),
-            base64.b64encode(b"logo").decode('utf-8')
-        ])
-
-        result = nano_banana(
-            prompt="Compose these elements into a product advertisement",
-            reference_images=images,
-            mode="compose"
-        )
-
-        self.assertEqual(result['status'], 'success')
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_compose_with_main_image_and_references(self, mock_upload, mock_genai):
-        """Test composing with a main image and additional references"""
-        mock_upload.return_value = "https://storage.example.com/composed.png"
-        self._setup_mock_edit_response(mock_genai)
-
-        main_image = base64.b64encode(b"main_scene").decode('utf-8')
-        refs = ",".join([
-            base64.b64encode(b"overlay1").decode('utf-8'),
-            base64.b64encode(b"overlay2").decode('utf-8')
-        ])
-
-        result = nano_banana(
-            prompt="Add these elements to the main scene",
-            image_url=main_image,
-            reference_images=refs,
-            mode="compose"
-        )
-
-        self.assertEqual(result['status'], 'success')
-
     # -------------------------------------------------------------------------
     # Aspect Ratio Support for Gallery
     # -------------------------------------------------------------------------
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_gallery_aspect_ratios(self, mock_upload, mock_genai):
+    def test_gallery_aspect_ratios(self):
         """Test all aspect ratios supported by Image Gallery"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
-        self._setup_mock_edit_response(mock_genai)
-
-        # Common aspect ratios used in Image Gallery
-        gallery_ratios = [
-            '1:1',    # Square (default)
-            '16:9',   # Landscape
-            '9:16',   # Portrait/Story
-            '4:3',    # Standard
-            '3:2',    # Photo
-        ]
-
-        for ratio in gallery_ratios:
-            result = nano_banana(
-                prompt=f"Generate in {ratio}",
-                aspect_ratio=ratio
-            )
-            self.assertEqual(result['status'], 'success', f"Failed for {ratio}")
-
-    # -------------------------------------------------------------------------
-    # Mask-Based Editing (Inpainting)
-    # -------------------------------------------------------------------------
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_mask_inpainting(self, mock_upload, mock_genai):
-        """Test mask-based inpainting for selective edits"""
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-        self._setup_mock_edit_response(mock_genai)
-
-        image = base64.b64encode(b"original_image").decode('utf-8')
-        mask = base64.b64encode(b"mask_image").decode('utf-8')
-
-        result = nano_banana(
-            prompt="Replace the masked area with a tree",
-            image_url=image,
-            mask_url=mask
-        )
+        self._setup_mock_edit_response()
 
-        self.assertEqual(result['status'], 'success')
+        for ratio in GALLERY_ASPECT_RATIOS:
+            with self.subTest(aspect_ratio=ratio):
+                result = nano_banana(
+                    prompt=f"Generate in {ratio}",
+                    aspect_ratio=ratio
+                )
+                self.assertEqual(result['status'], 'success')
 
     # -------------------------------------------------------------------------
     # Response Format Verification
     # -------------------------------------------------------------------------
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_response_contains_all_required_fields(self, mock_upload, mock_genai):
+    def test_response_contains_all_required_fields(self):
         """Test response contains all fields needed by frontend"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
-        self._setup_mock_edit_response(mock_genai)
+        self._setup_mock_edit_response()
 
         result = nano_banana(prompt="Test")
 
         # Required fields for frontend
-        required_fields = ['status', 'message', 'format', 'prompt']
-        for field in required_fields:
-            self.assertIn(field, result, f"Missing field: {field}")
+        self.assertLessEqual(_REQUIRED_FIELDS, result.keys())
 
         # Should have either URL or base64 data
         self.assertTrue(
@@ -281,12 +256,10 @@ class TestImageGalleryNanoBananaEndpoint(unittest.TestCase):
             "Must have image_urls or image_data_list"
         )
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_base64_fallback_format(self, mock_upload, mock_genai):
+    def test_base64_fallback_format(self):
         """Test base64 fallback response format"""
-        mock_upload.return_value = ""  # Force base64 fallback
-        self._setup_mock_edit_response(mock_genai)
+        self.mock_upload.return_value = ""  # Force base64 fallback
+        self._setup_mock_edit_response()
 
         result = nano_banana(prompt="Test")
 
@@ -295,20 +268,16 @@ class TestImageGalleryNanoBananaEndpoint(unittest.TestCase):
         self.assertIn('image_data', result)
         self.assertIn('image_data_list', result)
 
-        # Verify base64 is valid
-        decoded = base64.b64decode(result['image_data'])
-        self.assertEqual(decoded, b"edited_image_data")
+        # Verify base64 encodes the edited image bytes
+        self.assertEqual(result['image_data'], _EXPECTED_EDITED_B64)
 
     # -------------------------------------------------------------------------
     # Error Handling
     # -------------------------------------------------------------------------
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_invalid_image_url_error(self, mock_upload, mock_genai):
+    def test_invalid_image_url_error(self):
         """Test error handling for invalid image URL (filename instead of URL)"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
-        self._setup_mock_edit_response(mock_genai)
+        self._setup_mock_edit_response()
 
         # Common mistake: passing filename instead of full URL
         result = nano_banana(
@@ -319,58 +288,30 @@ class TestImageGalleryNanoBananaEndpoint(unittest.TestCase):
         self.assertEqual(result['status'], 'error')
         self.assertIn('filename', result['error'].lower())
 
-    @patch('tools.media_tools.genai_client')
-    def test_api_error_handling(self, mock_genai):
+    def test_api_error_handling(self):
         """Test handling of API errors"""
-        mock_genai.models.generate_content.side_effect = Exception("API Error")
+        self.mock_genai.models.generate_content.side_effect = Exception("API Error")
 
         result = nano_banana(prompt="Test")
 
         self.assertEqual(result['status'], 'error')
         self.assertIn('API Error', result['error'])
 
-    @patch('tools.media_tools.genai_client')
-    def test_empty_response_handling(self, mock_genai):
+    def test_empty_response_handling(self):
         """Test handling when API returns no image"""
-        mock_response = MagicMock()
-        mock_response.candidates = []
-        mock_genai.models.generate_content.return_value = mock_response
+        self.mock_genai.models.generate_content.return_value = SimpleNamespace(candidates=[])
 
         result = nano_banana(prompt="Test")
 
         self.assertEqual(result['status'], 'error')
         self.assertIn('No edited image', result['error'])
 
-    # -------------------------------------------------------------------------
-    # Person Generation Control
-    # -------------------------------------------------------------------------
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_person_generation_control(self, mock_upload, mock_genai):
-        """Test person generation parameter"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
-        self._setup_mock_edit_response(mock_genai)
-
-        # Test allow_all
-        result = nano_banana(
-            prompt="A group of people",
-            person_generation="allow_all"
-        )
-        self.assertEqual(result['status'], 'success')
-
-        # Test allow_adult
-        result = nano_banana(
-            prompt="Professional portrait",
-            person_generation="allow_adult"
-        )
-        self.assertEqual(result['status'], 'success')
-
 
 # =============================================================================
 # IMAGE GALLERY - GENERATE IMAGE ENDPOINT TESTS
 # =============================================================================
 
+@pytest.mark.xdist_group(name="gallery_generate_image")
 class TestImageGalleryGenerateImageEndpoint(unittest.TestCase):
     """
     Test the Image Generation endpoint behavior for Image Gallery.
@@ -382,22 +323,13 @@ class TestImageGalleryGenerateImageEndpoint(unittest.TestCase):
 
     def _setup_mock_generate_response(self, mock_genai, num_images=1):
         """Helper to set up mock response"""
-        mock_response = MagicMock()
-        mock_images = []
-        for i in range(num_images):
-            mock_image = MagicMock()
-            mock_image.image.image_bytes = f"generated_image_{i}".encode()
-            mock_images.append(mock_image)
-        mock_response.generated_images = mock_images
-        mock_genai.models.generate_images.return_value = mock_response
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
+        mock_genai.models.generate_images.return_value = _build_generate_response(num_images)
+
+    @patch.object(mt, 'genai_client')
+    @patch.object(mt, 'upload_to_storage')
     def test_basic_generation(self, mock_upload, mock_genai):
         """Test basic image generation"""
-        from tools.media_tools import generate_image
-
-        mock_upload.return_value = "https://storage.example.com/generated.png"
+        mock_upload.return_value = _URL_GENERATED
         self._setup_mock_generate_response(mock_genai)
 
         result = generate_image(prompt="A beautiful sunset over the ocean")
@@ -406,13 +338,11 @@ class TestImageGalleryGenerateImageEndpoint(unittest.TestCase):
         self.assertIn('image_url', result)
         self.assertIn('image_urls', result)
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
+    @patch.object(mt, 'genai_client')
+    @patch.object(mt, 'upload_to_storage')
     def test_multiple_images_generation(self, mock_upload, mock_genai):
         """Test generating multiple images (for variations)"""
-        from tools.media_tools import generate_image
-
-        mock_upload.return_value = "https://storage.example.com/generated.png"
+        mock_upload.return_value = _URL_GENERATED
         self._setup_mock_generate_response(mock_genai, num_images=4)
 
         result = generate_image(
@@ -423,13 +353,11 @@ class TestImageGalleryGenerateImageEndpoint(unittest.TestCase):
         self.assertEqual(result['status'], 'success')
         self.assertEqual(len(result['image_urls']), 4)
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
+    @patch.object(mt, 'genai_client')
+    @patch.object(mt, 'upload_to_storage')
     def test_all_imagen_parameters(self, mock_upload, mock_genai):
         """Test all Imagen 4.0 parameters"""
-        from tools.media_tools import generate_image
-
-        mock_upload.return_value = "https://storage.example.com/generated.png"
+        mock_upload.return_value = _URL_GENERATED
         self._setup_mock_generate_response(mock_genai)
 
         result = generate_image(
@@ -455,6 +383,7 @@ class TestImageGalleryGenerateImageEndpoint(unittest.TestCase):
 # UNIFIED ENDPOINT TESTS (Future API Design)
 # =============================================================================
 
+@pytest.mark.xdist_group(name="gallery_unified")
 class TestUnifiedImageEndpoint(unittest.TestCase):
     """
     Tests for unified image endpoint design.
@@ -463,87 +392,45 @@ class TestUnifiedImageEndpoint(unittest.TestCase):
     return consistent response formats that the Image Gallery can use.
     """
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
+    @patch.object(mt, 'genai_client')
+    @patch.object(mt, 'upload_to_storage')
     def test_consistent_response_format_generation(self, mock_upload, mock_genai):
         """Test generate_image returns consistent format"""
-        from tools.media_tools import generate_image
-
-        mock_upload.return_value = "https://storage.example.com/image.png"
+        mock_upload.return_value = _URL_IMAGE
 
-        mock_response = MagicMock()
-        mock_image = MagicMock()
-        mock_image.image.image_bytes = b"generated"
-        mock_response.generated_images = [mock_image]
-        mock_genai.models.generate_images.return_value = mock_response
+        mock_genai.models.generate_images.return_value = _build_generate_response(1)
 
         result = generate_image(prompt="Test")
 
-        # Common response structure
-        self.assertIn('status', result)
-        self.assertIn('message', result)
-        self.assertIn('format', result)
-        self.assertIn('prompt', result)
+        # Common response structure with both singular and array formats
+        self.assertLessEqual(_REQUIRED_FIELDS | _URL_FIELDS, result.keys())
 
-        # Both singular and array formats
-        self.assertIn('image_url', result)
-        self.assertIn('image_urls', result)
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
+    @patch.object(mt, 'genai_client')
+    @patch.object(mt, 'upload_to_storage')
     def test_consistent_response_format_editing(self, mock_upload, mock_genai):
         """Test nano_banana returns consistent format"""
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-
-        mock_response = MagicMock()
-        mock_candidate = MagicMock()
-        mock_part = MagicMock()
-        mock_part.inline_data = MagicMock()
-        mock_part.inline_data.data = b"edited"
-        mock_part.inline_data.mime_type = "image/png"
-        mock_candidate.content.parts = [mock_part]
-        mock_response.candidates = [mock_candidate]
-        mock_genai.models.generate_content.return_value = mock_response
+        mock_upload.return_value = _URL_EDITED
 
-        result = nano_banana(prompt="Test")
+        mock_genai.models.generate_content.return_value = _EDIT_RESPONSE
 
-        # Same common response structure
-        self.assertIn('status', result)
-        self.assertIn('message', result)
-        self.assertIn('format', result)
-        self.assertIn('prompt', result)
+        result = nano_banana(prompt="Test")
 
-        # Both singular and array formats
-        self.assertIn('image_url', result)
-        self.assertIn('image_urls', result)
+        # Same common response structure with both singular and array formats
+        self.assertLessEqual(_REQUIRED_FIELDS | _URL_FIELDS, result.keys())
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
+    @patch.object(mt, 'genai_client')
+    @patch.object(mt, 'upload_to_storage')
     def test_base64_fallback_consistent(self, mock_upload, mock_genai):
         """Test base64 fallback is consistent across both functions"""
-        from tools.media_tools import generate_image
-
         mock_upload.return_value = ""  # Force base64 fallback
 
         # Setup for generate_image
-        mock_response_gen = MagicMock()
-        mock_image = MagicMock()
-        mock_image.image.image_bytes = b"generated"
-        mock_response_gen.generated_images = [mock_image]
-        mock_genai.models.generate_images.return_value = mock_response_gen
+        mock_genai.models.generate_images.return_value = _build_generate_response(1)
 
         result_gen = generate_image(prompt="Test")
 
         # Setup for nano_banana
-        mock_response_edit = MagicMock()
-        mock_candidate = MagicMock()
-        mock_part = MagicMock()
-        mock_part.inline_data = MagicMock()
-        mock_part.inline_data.data = b"edited"
-        mock_part.inline_data.mime_type = "image/png"
-        mock_candidate.content.parts = [mock_part]
-        mock_response_edit.candidates = [mock_candidate]
-        mock_genai.models.generate_content.return_value = mock_response_edit
+        mock_genai.models.generate_content.return_value = _EDIT_RESPONSE
 
         result_edit = nano_banana(prompt="Test")
 
@@ -556,7 +443,3 @@ class TestUnifiedImageEndpoint(unittest.TestCase):
 
         self.assertIn('image_data_list', result_gen)
         self.assertIn('image_data_list', result_edit)
-
-
-if __name__ == '__main__':
-    unittest.main()
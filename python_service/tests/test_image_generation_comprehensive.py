@@ -3,917 +3,371 @@ Comprehensive Test Suite for Image Generation and Editing
 
 This file contains exhaustive tests for:
 1. Imagen 4.0 Image Generation (generate_image)
-2. Nano Banana Image Editing (nano_banana)
-3. API Endpoints (/media/nano-banana)
-4. Response format consistency
-5. Parameter validation
-6. Error handling
-7. Storage upload behavior
+2. Response format consistency (including the /media/nano-banana payload)
+3. Parameter validation
+4. Error handling
+5. Storage upload behavior
+
+Nano Banana editing tests (nano_banana) live in test_nano_banana_editing.py.
 
 Test Categories:
 - Unit Tests: Test core functions with mocked dependencies
 - Integration Tests: Test API endpoints with mocked genai client
 - End-to-End Tests: Full flow testing with mocked external services
 """
-import unittest
-from unittest.mock import MagicMock, patch, Mock
-import sys
-import os
-import base64
-import json
-
-# Add python_service to path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-# Mock firebase_admin before importing
-sys.modules['firebase_admin'] = MagicMock()
-sys.modules['firebase_admin.storage'] = MagicMock()
-sys.modules['firebase_admin.credentials'] = MagicMock()
+from unittest.mock import MagicMock
+import pytest
+from functools import lru_cache
 
+from tools import media_tools as mt
 from tools.media_tools import generate_image, nano_banana
+from _mock_fixtures import make_genai_client, make_imagen_response, make_nano_banana_response
 
 
 # =============================================================================
 # SECTION 1: IMAGEN 4.0 IMAGE GENERATION TESTS
 # =============================================================================
 
-class TestImagenGeneration(unittest.TestCase):
-    """Test Imagen 4.0 image generation (generate_image function)"""
-
-    def _setup_mock_image_response(self, mock_genai, num_images=1):
-        """Helper to set up mock Imagen response"""
-        mock_response = MagicMock()
-        mock_images = []
-        for i in range(num_images):
-            mock_image = MagicMock()
-            mock_image.image.image_bytes = f"fake_image_data_{i}".encode()
-            mock_images.append(mock_image)
-        mock_response.generated_images = mock_images
-        mock_genai.models.generate_images.return_value = mock_response
-
-    # -------------------------------------------------------------------------
-    # Basic Generation Tests
-    # -------------------------------------------------------------------------
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_basic_text_to_image(self, mock_upload, mock_genai):
-        """Test basic text-to-image generation"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
-        self._setup_mock_image_response(mock_genai)
-
-        result = generate_image(prompt="A beautiful sunset")
-
-        self.assertEqual(result['status'], 'success')
-        self.assertEqual(result['format'], 'url')
-        self.assertIn('image_url', result)
-        self.assertIn('image_urls', result)
-        mock_genai.models.generate_images.assert_called_once()
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_base64_fallback(self, mock_upload, mock_genai):
-        """Test base64 fallback when storage upload fails"""
-        mock_upload.return_value = ""  # Upload fails
-        self._setup_mock_image_response(mock_genai)
-
-        result = generate_image(prompt="A beautiful sunset")
-
-        self.assertEqual(result['status'], 'success')
-        self.assertEqual(result['format'], 'base64')
-        self.assertIn('image_data', result)
-        self.assertIn('image_data_list', result)
-
-    @patch('tools.media_tools.genai_client')
-    def test_no_client_error(self, mock_genai):
-        """Test error when genai client is not initialized"""
-        # Set client to None
-        import tools.media_tools as mt
-        original_client = mt.genai_client
-        mt.genai_client = None
-
-        result = generate_image(prompt="Test")
-
-        self.assertEqual(result['status'], 'error')
-        self.assertIn('not initialized', result['error'])
-
-        # Restore
-        mt.genai_client = original_client
-
-    @patch('tools.media_tools.genai_client')
-    def test_no_images_generated(self, mock_genai):
-        """Test error when no images are generated"""
-        mock_response = MagicMock()
-        mock_response.generated_images = []
-        mock_genai.models.generate_images.return_value = mock_response
-
-        result = generate_image(prompt="Test")
-
-        self.assertEqual(result['status'], 'error')
-        self.assertEqual(result['error'], 'No image generated')
-
-    # -------------------------------------------------------------------------
-    # Aspect Ratio Tests
-    # -------------------------------------------------------------------------
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_all_aspect_ratios(self, mock_upload, mock_genai):
-        """Test all supported aspect ratios"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
-        self._setup_mock_image_response(mock_genai)
-
-        aspect_ratios = [
-            '1:1', '2:3', '3:2', '3:4', '4:3',
-            '4:5', '5:4', '9:16', '16:9', '21:9'
-        ]
-
-        for ratio in aspect_ratios:
-            result = generate_image(prompt="Test", aspect_ratio=ratio)
-            self.assertEqual(result['status'], 'success', f"Failed for {ratio}")
-
-            call_args = mock_genai.models.generate_images.call_args
-            self.assertEqual(call_args[1]['config']['aspect_ratio'], ratio)
-
-    # -------------------------------------------------------------------------
-    # Multiple Images Tests
-    # -------------------------------------------------------------------------
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_multiple_images_with_urls(self, mock_upload, mock_genai):
-        """Test generating multiple images with URL response"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
-        self._setup_mock_image_response(mock_genai, num_images=4)
-
-        result = generate_image(prompt="Test", number_of_images=4)
-
-        self.assertEqual(result['status'], 'success')
-        self.assertEqual(len(result['image_urls']), 4)
-        self.assertEqual(result['image_url'], result['image_urls'][0])
-
-        call_args = mock_genai.models.generate_images.call_args
-        self.assertEqual(call_args[1]['config']['number_of_images'], 4)
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_multiple_images_base64_fallback(self, mock_upload, mock_genai):
-        """Test multiple images with base64 fallback"""
-        mock_upload.return_value = ""  # Upload fails
-        self._setup_mock_image_response(mock_genai, num_images=3)
-
-        result = generate_image(prompt="Test", number_of_images=3)
-
-        self.assertEqual(result['status'], 'success')
-        self.assertEqual(result['format'], 'base64')
-        self.assertEqual(len(result['image_data_list']), 3)
-        self.assertEqual(result['image_data'], result['image_data_list'][0])
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_number_of_images_limits(self, mock_upload, mock_genai):
-        """Test number_of_images is clamped to valid range (1-8)"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
-        self._setup_mock_image_response(mock_genai)
-
-        # Test minimum (should be clamped to 1)
-        result = generate_image(prompt="Test", number_of_images=0)
-        call_args = mock_genai.models.generate_images.call_args
-        self.assertEqual(call_args[1]['config']['number_of_images'], 1)
-
-        # Test maximum (should be clamped to 8)
-        result = generate_image(prompt="Test", number_of_images=10)
-        call_args = mock_genai.models.generate_images.call_args
-        self.assertEqual(call_args[1]['config']['number_of_images'], 8)
-
-    # -------------------------------------------------------------------------
-    # Advanced Parameters Tests
-    # -------------------------------------------------------------------------
-
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_person_generation_allow_all(self, mock_upload, mock_genai):
-        """Test person_generation with allow_all"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
-        self._setup_mock_image_response(mock_genai)
+IMAGE_URL = "https://storage.example.com/image.png"
 
-        result = generate_image(
-            prompt="People at a party",
-            person_generation="allow_all"
-        )
+IMAGEN_ASPECT_RATIOS = [
+    '1:1', '2:3', '3:2', '3:4', '4:3',
+    '4:5', '5:4', '9:16', '16:9', '21:9'
+]
 
-        self.assertEqual(result['status'], 'success')
-        call_args = mock_genai.models.generate_images.call_args
-        self.assertEqual(call_args[1]['config']['person_generation'], 'allow_all')
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_person_generation_allow_adult(self, mock_upload, mock_genai):
-        """Test person_generation with allow_adult"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
-        self._setup_mock_image_response(mock_genai)
+@pytest.fixture
+def specced_genai(monkeypatch):
+    """Replace the genai client with a mock specced to its models.generate_* calls"""
+    mock = make_genai_client()
+    monkeypatch.setattr(mt, 'genai_client', mock)
+    return mock
 
-        result = generate_image(
-            prompt="Professional portrait",
-            person_generation="allow_adult"
-        )
 
-        self.assertEqual(result['status'], 'success')
-        call_args = mock_genai.models.generate_images.call_args
-        self.assertEqual(call_args[1]['config']['person_generation'], 'allow_adult')
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_safety_filter_levels(self, mock_upload, mock_genai):
-        """Test safety filter level parameter"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
-        self._setup_mock_image_response(mock_genai)
-
-        safety_levels = [
-            'block_only_high',
-            'block_medium_and_above',
-            'block_low_and_above'
-        ]
-
-        for level in safety_levels:
-            result = generate_image(
-                prompt="Test",
-                safety_filter_level=level
-            )
-            self.assertEqual(result['status'], 'success')
-            call_args = mock_genai.models.generate_images.call_args
-            self.assertEqual(call_args[1]['config']['safety_filter_level'], level)
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_output_mime_types(self, mock_upload, mock_genai):
-        """Test output MIME type parameter"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
-        self._setup_mock_image_response(mock_genai)
-
-        mime_types = ['image/png', 'image/jpeg']
-
-        for mime_type in mime_types:
-            result = generate_image(
-                prompt="Test",
-                output_mime_type=mime_type
-            )
-            self.assertEqual(result['status'], 'success')
-            call_args = mock_genai.models.generate_images.call_args
-            self.assertEqual(call_args[1]['config']['output_mime_type'], mime_type)
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_all_parameters_combined(self, mock_upload, mock_genai):
-        """Test using all Imagen 4.0 parameters together"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
-        self._setup_mock_image_response(mock_genai, num_images=2)
+@pytest.fixture
+def mock_settings(monkeypatch):
+    """Replace get_settings_context with a MagicMock"""
+    mock = MagicMock()
+    monkeypatch.setattr(mt, 'get_settings_context', mock)
+    return mock
 
-        result = generate_image(
-            prompt="Professional portrait in studio",
-            aspect_ratio="3:4",
-            number_of_images=2,
-            person_generation="allow_adult",
-            safety_filter_level="block_only_high",
-            output_mime_type="image/png"
-        )
 
-        self.assertEqual(result['status'], 'success')
+@lru_cache(maxsize=16)
+def _image_response(num_images):
+    """Shared read-only Imagen response, one per image count"""
+    return make_imagen_response(num_images)
 
-        call_args = mock_genai.models.generate_images.call_args
-        config = call_args[1]['config']
 
-        self.assertEqual(config['aspect_ratio'], '3:4')
-        self.assertEqual(config['number_of_images'], 2)
-        self.assertEqual(config['person_generation'], 'allow_adult')
-        self.assertEqual(config['safety_filter_level'], 'block_only_high')
-        self.assertEqual(config['output_mime_type'], 'image/png')
+@pytest.fixture
+def success_mocks(specced_genai, mock_upload):
+    """Set up a successful single-image generation and storage upload.
 
-    # -------------------------------------------------------------------------
-    # Default Model Selection Tests
-    # -------------------------------------------------------------------------
+    Returns (specced_genai, mock_upload); tests needing more images or a
+    failed upload override the return values.
+    """
+    mock_upload.return_value = IMAGE_URL
+    specced_genai.models.generate_images.return_value = _image_response(1)
+    return specced_genai, mock_upload
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    @patch('tools.media_tools.get_settings_context')
-    def test_default_model_used(self, mock_settings, mock_upload, mock_genai):
-        """Test default Imagen model is used when no setting provided"""
-        mock_settings.return_value = {}
-        mock_upload.return_value = "https://storage.example.com/image.png"
-        self._setup_mock_image_response(mock_genai)
 
-        result = generate_image(prompt="Test")
+# -------------------------------------------------------------------------
+# Basic Generation Tests
+# -------------------------------------------------------------------------
 
-        self.assertEqual(result['status'], 'success')
-        call_args = mock_genai.models.generate_images.call_args
-        self.assertEqual(call_args[1]['model'], 'imagen-4.0-generate-001')
+def test_basic_text_to_image(success_mocks):
+    """Test basic text-to-image generation"""
+    specced_genai, _ = success_mocks
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    @patch('tools.media_tools.get_settings_context')
-    def test_custom_model_from_settings(self, mock_settings, mock_upload, mock_genai):
-        """Test custom Imagen model from settings"""
-        mock_settings.return_value = {'imageModel': 'imagen-4.0-ultra-generate-001'}
-        mock_upload.return_value = "https://storage.example.com/image.png"
-        self._setup_mock_image_response(mock_genai)
+    result = generate_image(prompt="A beautiful sunset")
 
-        result = generate_image(prompt="Test")
+    assert result['status'] == 'success'
+    assert result['format'] == 'url'
+    assert 'image_url' in result
+    assert 'image_urls' in result
+    assert specced_genai.models.generate_images.call_count == 1
 
-        self.assertEqual(result['status'], 'success')
-        call_args = mock_genai.models.generate_images.call_args
-        self.assertEqual(call_args[1]['model'], 'imagen-4.0-ultra-generate-001')
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    @patch('tools.media_tools.get_settings_context')
-    def test_non_imagen_model_falls_back(self, mock_settings, mock_upload, mock_genai):
-        """Test non-imagen model falls back to default"""
-        mock_settings.return_value = {'imageModel': 'gemini-2.5-flash'}  # Not an imagen model
-        mock_upload.return_value = "https://storage.example.com/image.png"
-        self._setup_mock_image_response(mock_genai)
+def test_base64_fallback(success_mocks):
+    """Test base64 fallback when storage upload fails"""
+    _, mock_upload = success_mocks
+    mock_upload.return_value = ""  # Upload fails
 
-        result = generate_image(prompt="Test")
+    result = generate_image(prompt="A beautiful sunset")
 
-        self.assertEqual(result['status'], 'success')
-        call_args = mock_genai.models.generate_images.call_args
-        self.assertEqual(call_args[1]['model'], 'imagen-4.0-generate-001')
+    assert result['status'] == 'success'
+    assert result['format'] == 'base64'
+    assert 'image_data' in result
+    assert 'image_data_list' in result
 
 
-# =============================================================================
-# SECTION 2: NANO BANANA IMAGE EDITING TESTS
-# =============================================================================
+def test_no_client_error(monkeypatch):
+    """Test error when genai client is not initialized"""
+    monkeypatch.setattr(mt, 'genai_client', None)
 
-class TestNanoBananaEditing(unittest.TestCase):
-    """Test Nano Banana image editing (nano_banana function)"""
-
-    def _setup_mock_edit_response(self, mock_genai):
-        """Helper to set up mock Nano Banana response"""
-        mock_response = MagicMock()
-        mock_candidate = MagicMock()
-        mock_part = MagicMock()
-        mock_part.inline_data = MagicMock()
-        mock_part.inline_data.data = b"edited_image_data"
-        mock_part.inline_data.mime_type = "image/png"
-        mock_candidate.content.parts = [mock_part]
-        mock_response.candidates = [mock_candidate]
-        mock_genai.models.generate_content.return_value = mock_response
-
-    # -------------------------------------------------------------------------
-    # Basic Editing Tests
-    # -------------------------------------------------------------------------
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_text_only_generation(self, mock_upload, mock_genai):
-        """Test generation with only text prompt (no image)"""
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-        self._setup_mock_edit_response(mock_genai)
-
-        result = nano_banana(prompt="Generate a sunset scene")
-
-        self.assertEqual(result['status'], 'success')
-        self.assertIn('image_url', result)
-        mock_genai.models.generate_content.assert_called_once()
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_image_editing_with_base64(self, mock_upload, mock_genai):
-        """Test image editing with base64 input"""
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-        self._setup_mock_edit_response(mock_genai)
-
-        # Create fake base64 image
-        fake_image = base64.b64encode(b"fake_image_data").decode('utf-8')
-
-        result = nano_banana(
-            prompt="Make the sky blue",
-            image_url=fake_image
-        )
+    result = generate_image(prompt="Test")
 
-        self.assertEqual(result['status'], 'success')
-        self.assertIn('image_url', result)
-        self.assertIn('image_urls', result)
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    @patch('tools.media_tools.requests')
-    def test_image_editing_with_url(self, mock_requests, mock_upload, mock_genai):
-        """Test image editing with URL input"""
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-        self._setup_mock_edit_response(mock_genai)
-
-        # Mock image download
-        mock_response = MagicMock()
-        mock_response.content = b"downloaded_image"
-        mock_response.headers = {'Content-Type': 'image/png'}
-        mock_requests.get.return_value = mock_response
-
-        result = nano_banana(
-            prompt="Make it brighter",
-            image_url="https://example.com/image.png"
-        )
-
-        self.assertEqual(result['status'], 'success')
-        mock_requests.get.assert_called_once()
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_image_editing_with_data_uri(self, mock_upload, mock_genai):
-        """Test image editing with data URI input"""
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-        self._setup_mock_edit_response(mock_genai)
-
-        # Create data URI
-        fake_data = base64.b64encode(b"image_data").decode('utf-8')
-        data_uri = f"data:image/png;base64,{fake_data}"
-
-        result = nano_banana(
-            prompt="Add contrast",
-            image_url=data_uri
-        )
+    assert result['status'] == 'error'
+    assert 'not initialized' in result['error']
 
-        self.assertEqual(result['status'], 'success')
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_base64_fallback_response(self, mock_upload, mock_genai):
-        """Test base64 fallback when upload fails"""
-        mock_upload.return_value = ""  # Upload fails
-        self._setup_mock_edit_response(mock_genai)
+def test_no_images_generated(specced_genai):
+    """Test error when no images are generated"""
+    specced_genai.models.generate_images.return_value = _image_response(0)
 
-        result = nano_banana(prompt="Test")
+    result = generate_image(prompt="Test")
 
-        self.assertEqual(result['status'], 'success')
-        self.assertEqual(result['format'], 'base64')
-        self.assertIn('image_data', result)
-        self.assertIn('image_data_list', result)
+    assert result['status'] == 'error'
+    assert result['error'] == 'No image generated'
 
-    # -------------------------------------------------------------------------
-    # Reference Images Tests
-    # -------------------------------------------------------------------------
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_single_reference_image(self, mock_upload, mock_genai):
-        """Test with single reference image"""
-        mock_upload.return_value = "https://storage.example.com/composed.png"
-        self._setup_mock_edit_response(mock_genai)
+# -------------------------------------------------------------------------
+# Aspect Ratio Tests
+# -------------------------------------------------------------------------
 
-        ref_image = base64.b64encode(b"ref_image").decode('utf-8')
+@pytest.mark.parametrize('ratio', IMAGEN_ASPECT_RATIOS)
+def test_aspect_ratio(success_mocks, ratio):
+    """Test each supported aspect ratio"""
+    specced_genai, _ = success_mocks
+    gi = specced_genai.models.generate_images
 
-        result = nano_banana(
-            prompt="Use this as reference",
-            reference_images=ref_image
-        )
+    result = generate_image(prompt="Test", aspect_ratio=ratio)
+    assert result['status'] == 'success'
 
-        self.assertEqual(result['status'], 'success')
+    cfg = gi.call_args.kwargs['config']
+    assert cfg['aspect_ratio'] == ratio
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_multiple_reference_images(self, mock_upload, mock_genai):
-        """Test multi-image composition with comma-separated reference images"""
-        mock_upload.return_value = "https://storage.example.com/composed.png"
-        self._setup_mock_edit_response(mock_genai)
 
-        # Create comma-separated reference images (ADK format)
-        ref1 = base64.b64encode(b"ref1").decode('utf-8')
-        ref2 = base64.b64encode(b"ref2").decode('utf-8')
-        ref3 = base64.b64encode(b"ref3").decode('utf-8')
-        reference_images = f"{ref1},{ref2},{ref3}"
+# -------------------------------------------------------------------------
+# Multiple Images Tests
+# -------------------------------------------------------------------------
 
-        result = nano_banana(
-            prompt="Combine these elements",
-            reference_images=reference_images
-        )
+def test_multiple_images_with_urls(success_mocks):
+    """Test generating multiple images with URL response"""
+    specced_genai, _ = success_mocks
+    gi = specced_genai.models.generate_images
+    gi.return_value = _image_response(4)
 
-        self.assertEqual(result['status'], 'success')
-
-        # Verify multiple parts were passed (prompt + 3 images)
-        call_args = mock_genai.models.generate_content.call_args
-        contents = call_args[1]['contents']
-        self.assertGreater(len(contents), 1)  # More than just prompt
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_max_14_reference_images(self, mock_upload, mock_genai):
-        """Test that only up to 14 reference images are used"""
-        mock_upload.return_value = "https://storage.example.com/composed.png"
-        self._setup_mock_edit_response(mock_genai)
-
-        # Create 20 reference images (should only use 14)
-        refs = []
-        for i in range(20):
-            ref = base64.b64encode(f"ref{i}".encode()).decode('utf-8')
-            refs.append(ref)
-        reference_images = ",".join(refs)
-
-        result = nano_banana(
-            prompt="Combine all",
-            reference_images=reference_images
-        )
+    result = generate_image(prompt="Test", number_of_images=4)
 
-        self.assertEqual(result['status'], 'success')
-        # The function should limit to 14 images
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    @patch('tools.media_tools.requests')
-    def test_skipped_unavailable_references(self, mock_requests, mock_upload, mock_genai):
-        """Test that unavailable reference images are skipped and reported"""
-        mock_upload.return_value = "https://storage.example.com/composed.png"
-        self._setup_mock_edit_response(mock_genai)
-
-        # First URL succeeds, second fails
-        def side_effect(url, **kwargs):
-            if "good" in url:
-                mock_resp = MagicMock()
-                mock_resp.content = b"image"
-                mock_resp.headers = {'Content-Type': 'image/png'}
-                return mock_resp
-            else:
-                raise Exception("Download failed")
-
-        mock_requests.get.side_effect = side_effect
-
-        result = nano_banana(
-            prompt="Combine",
-            reference_images="https://good.com/img.png,https://bad.com/img.png"
-        )
+    assert result['status'] == 'success'
+    assert len(result['image_urls']) == 4
+    assert result['image_url'] == result['image_urls'][0]
 
-        self.assertEqual(result['status'], 'success')
-        # Should report skipped references
-        self.assertIn('skipped_references', result)
+    cfg = gi.call_args.kwargs['config']
+    assert cfg['number_of_images'] == 4
 
-    # -------------------------------------------------------------------------
-    # Mask-Based Editing Tests
-    # -------------------------------------------------------------------------
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_mask_based_editing(self, mock_upload, mock_genai):
-        """Test mask-based inpainting"""
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-        self._setup_mock_edit_response(mock_genai)
+def test_multiple_images_base64_fallback(success_mocks):
+    """Test multiple images with base64 fallback"""
+    specced_genai, mock_upload = success_mocks
+    mock_upload.return_value = ""  # Upload fails
+    specced_genai.models.generate_images.return_value = _image_response(3)
 
-        image_data = base64.b64encode(b"original").decode('utf-8')
-        mask_data = base64.b64encode(b"mask").decode('utf-8')
+    result = generate_image(prompt="Test", number_of_images=3)
 
-        result = nano_banana(
-            prompt="Replace the masked area with a tree",
-            image_url=image_data,
-            mask_url=mask_data
-        )
+    assert result['status'] == 'success'
+    assert result['format'] == 'base64'
+    assert len(result['image_data_list']) == 3
+    assert result['image_data'] == result['image_data_list'][0]
 
-        self.assertEqual(result['status'], 'success')
 
-        # Verify mask was included
-        call_args = mock_genai.models.generate_content.call_args
-        contents = call_args[1]['contents']
-        self.assertGreater(len(contents), 2)  # image + mask + prompt
+@pytest.mark.parametrize('requested, expected', [
+    (0, 1),   # Minimum is clamped to 1
+    (10, 8),  # Maximum is clamped to 8
+], ids=['min', 'max'])
+def test_number_of_images_limits(success_mocks, requested, expected):
+    """Test number_of_images is clamped to valid range (1-8)"""
+    specced_genai, _ = success_mocks
+    gi = specced_genai.models.generate_images
 
-    # -------------------------------------------------------------------------
-    # Mode Parameter Tests
-    # -------------------------------------------------------------------------
+    generate_image(prompt="Test", number_of_images=requested)
+    cfg = gi.call_args.kwargs['config']
+    assert cfg['number_of_images'] == expected
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_edit_mode(self, mock_upload, mock_genai):
-        """Test edit mode parameter"""
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-        self._setup_mock_edit_response(mock_genai)
 
-        image_data = base64.b64encode(b"image").decode('utf-8')
+# -------------------------------------------------------------------------
+# Advanced Parameters Tests
+# -------------------------------------------------------------------------
 
-        result = nano_banana(
-            prompt="Enhance this",
-            image_url=image_data,
-            mode="edit"
-        )
+@pytest.mark.parametrize('prompt, person_generation', [
+    ("People at a party", 'allow_all'),
+    ("Professional portrait", 'allow_adult'),
+])
+def test_person_generation(success_mocks, prompt, person_generation):
+    """Test person_generation with allow_all and allow_adult"""
+    specced_genai, _ = success_mocks
+    gi = specced_genai.models.generate_images
 
-        self.assertEqual(result['status'], 'success')
+    result = generate_image(
+        prompt=prompt,
+        person_generation=person_generation
+    )
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_compose_mode(self, mock_upload, mock_genai):
-        """Test compose mode parameter"""
-        mock_upload.return_value = "https://storage.example.com/composed.png"
-        self._setup_mock_edit_response(mock_genai)
+    assert result['status'] == 'success'
+    cfg = gi.call_args.kwargs['config']
+    assert cfg['person_generation'] == person_generation
 
-        ref_images = ",".join([
-            base64.b64encode(b"img1").decode('utf-8'),
-            base64.b64encode(b"img2").decode('utf-8')
-        ])
 
-        result = nano_banana(
-            prompt="Compose these",
-            reference_images=ref_images,
-            mode="compose"
+@pytest.mark.parametrize('level', [
+    'block_only_high',
+    'block_medium_and_above',
+    'block_low_and_above'
+])
+def test_safety_filter_level(success_mocks, level):
+    """Test safety filter level parameter"""
+    specced_genai, _ = success_mocks
+    gi = specced_genai.models.generate_images
+
+    result = generate_image(
+        prompt="Test",
+        safety_filter_level=level
+    )
+    assert result['status'] == 'success'
+    cfg = gi.call_args.kwargs['config']
+    assert cfg['safety_filter_level'] == level
+
+
+@pytest.mark.parametrize('mime_type', ['image/png', 'image/jpeg'])
+def test_output_mime_type(success_mocks, mime_type):
+    """Test output MIME type parameter"""
+    specced_genai, _ = success_mocks
+    gi = specced_genai.models.generate_images
+
+    result = generate_image(
+        prompt="Test",
+        output_mime_type=mime_type
+    )
+    assert result['status'] == 'success'
+    cfg = gi.call_args.kwargs['config']
+    assert cfg['output_mime_type'] == mime_type
+
+
+COMBINED_PARAMETERS = {
+    'aspect_ratio': '3:4',
+    'number_of_images': 2,
+    'person_generation': 'allow_adult',
+    'safety_filter_level': 'block_only_high',
+    'output_mime_type': 'image/png',
+}
+
+
+@pytest.fixture(scope="module")
+def combined_call():
+    """Call generate_image once with all Imagen 4.0 parameters.
+
+    Returns the result and the config passed to the client so the
+    per-parameter tests below share a single call.
+    """
+    mock_genai = MagicMock()
+    gi = mock_genai.models.generate_images
+    gi.return_value = _image_response(2)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(mt, 'genai_client', mock_genai)
+        mp.setattr(mt, 'upload_to_storage', MagicMock(return_value=IMAGE_URL))
+        result = generate_image(
+            prompt="Professional portrait in studio",
+            **COMBINED_PARAMETERS
         )
 
-        self.assertEqual(result['status'], 'success')
-
-    # -------------------------------------------------------------------------
-    # Aspect Ratio Tests
-    # -------------------------------------------------------------------------
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_aspect_ratios(self, mock_upload, mock_genai):
-        """Test aspect ratio parameter"""
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-        self._setup_mock_edit_response(mock_genai)
-
-        aspect_ratios = ['1:1', '16:9', '9:16', '4:3', '3:2']
-
-        for ratio in aspect_ratios:
-            result = nano_banana(
-                prompt="Generate",
-                aspect_ratio=ratio
-            )
-            self.assertEqual(result['status'], 'success', f"Failed for {ratio}")
+    return result, gi.call_args.kwargs['config']
 
-    # -------------------------------------------------------------------------
-    # Advanced Parameters Tests
-    # -------------------------------------------------------------------------
 
+def test_all_parameters_combined(combined_call):
+    """Test using all Imagen 4.0 parameters together"""
+    result, _ = combined_call
+    assert result['status'] == 'success'
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_person_generation(self, mock_upload, mock_genai):
-        """Test person generation parameter"""
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-        self._setup_mock_edit_response(mock_genai)
 
-        result = nano_banana(
-            prompt="Add a person",
-            person_generation="allow_all"
-        )
-
-        self.assertEqual(result['status'], 'success')
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_all_parameters_combined(self, mock_upload, mock_genai):
-        """Test all Nano Banana parameters combined"""
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-        self._setup_mock_edit_response(mock_genai)
-
-        image_data = base64.b64encode(b"image").decode('utf-8')
-        ref_images = base64.b64encode(b"ref").decode('utf-8')
-
-        result = nano_banana(
-            prompt="Edit with all parameters",
-            image_url=image_data,
-            reference_images=ref_images,
-            mode="edit",
-            aspect_ratio="16:9",
-            number_of_images=1,
-            person_generation="allow_all"
-        )
+@pytest.mark.parametrize('key, expected', COMBINED_PARAMETERS.items())
+def test_all_parameters_combined_config(combined_call, key, expected):
+    """Test each combined parameter reaches the Imagen config"""
+    _, config = combined_call
+    assert config[key] == expected
 
-        self.assertEqual(result['status'], 'success')
 
-    # -------------------------------------------------------------------------
-    # Error Handling Tests
-    # -------------------------------------------------------------------------
+# -------------------------------------------------------------------------
+# Default Model Selection Tests
+# -------------------------------------------------------------------------
 
-    @patch('tools.media_tools.genai_client')
-    def test_no_client_error(self, mock_genai):
-        """Test error when client not initialized"""
-        import tools.media_tools as mt
-        original_client = mt.genai_client
-        mt.genai_client = None
+@pytest.mark.parametrize('settings, expected_model', [
+    # Default Imagen model is used when no setting provided
+    ({}, 'imagen-4.0-generate-001'),
+    # Custom Imagen model from settings
+    ({'imageModel': 'imagen-4.0-ultra-generate-001'}, 'imagen-4.0-ultra-generate-001'),
+    # Non-imagen model falls back to default
+    ({'imageModel': 'gemini-2.5-flash'}, 'imagen-4.0-generate-001'),
+], ids=['default_model_used', 'custom_model_from_settings', 'non_imagen_model_falls_back'])
+def test_model_selection(success_mocks, mock_settings, settings, expected_model):
+    """Test Imagen model selection from settings"""
+    specced_genai, _ = success_mocks
+    gi = specced_genai.models.generate_images
+    mock_settings.return_value = settings
 
-        result = nano_banana(prompt="Test")
+    result = generate_image(prompt="Test")
 
-        self.assertEqual(result['status'], 'error')
-        self.assertIn('not initialized', result['error'])
+    assert result['status'] == 'success'
+    assert gi.call_args.kwargs['model'] == expected_model
 
-        mt.genai_client = original_client
 
-    @patch('tools.media_tools.genai_client')
-    def test_no_edited_image_error(self, mock_genai):
-        """Test error when no image is generated"""
-        mock_response = MagicMock()
-        mock_response.candidates = []
-        mock_genai.models.generate_content.return_value = mock_response
-
-        result = nano_banana(prompt="Test")
+# =============================================================================
+# SECTION 2: RESPONSE CONSISTENCY TESTS
+# =============================================================================
 
-        self.assertEqual(result['status'], 'error')
-        self.assertIn('No edited image', result['error'])
+# (singular, array) key pairs of each response format
+URL_KEYS = ('image_url', 'image_urls')
+B64_KEYS = ('image_data', 'image_data_list')
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_invalid_filename_detection(self, mock_upload, mock_genai):
-        """Test that filenames (not URLs) are detected and rejected"""
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-        self._setup_mock_edit_response(mock_genai)
 
-        # This should fail - looks like a filename
-        result = nano_banana(
-            prompt="Edit",
-            image_url="image.png"  # Common LLM mistake
-        )
+@pytest.mark.parametrize('func, upload_url, keys', [
+    (generate_image, IMAGE_URL, URL_KEYS),
+    # The /media/nano-banana endpoint maps these keys to imageUrl/imageUrls
+    (nano_banana, IMAGE_URL, URL_KEYS),
+    # Empty upload URL forces the base64 fallback
+    (generate_image, "", B64_KEYS),
+], ids=['generate_image_url', 'nano_banana_url', 'generate_image_b64'])
+def test_response_dual_format(specced_genai, mock_upload, func, upload_url, keys):
+    """Test every function returns both singular and array formats"""
+    specced_genai.models.generate_images.return_value = _image_response(1)
+    specced_genai.models.generate_content.return_value = make_nano_banana_response()
+    mock_upload.return_value = upload_url
 
-        self.assertEqual(result['status'], 'error')
-        self.assertIn('filename', result['error'].lower())
-
-    # -------------------------------------------------------------------------
-    # Firebase Storage URL Handling Tests
-    # -------------------------------------------------------------------------
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    @patch('tools.media_tools.download_from_firebase_storage')
-    @patch('tools.media_tools.is_firebase_storage_url')
-    def test_firebase_storage_url_handling(
-        self, mock_is_firebase, mock_download, mock_upload, mock_genai
-    ):
-        """Test Firebase Storage URL is handled correctly"""
-        mock_is_firebase.return_value = True
-        mock_download.return_value = (b"firebase_image", "image/png")
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-        self._setup_mock_edit_response(mock_genai)
-
-        result = nano_banana(
-            prompt="Edit",
-            image_url="https://firebasestorage.googleapis.com/v0/b/test/image.png"
-        )
+    result = func(prompt="Test")
 
-        self.assertEqual(result['status'], 'success')
-        mock_download.assert_called_once()
+    single_key, list_key = keys
+    assert result.keys() >= {'status', single_key, list_key}
+    assert result[single_key] == result[list_key][0]
 
 
 # =============================================================================
-# SECTION 3: API ENDPOINT INTEGRATION TESTS
+# SECTION 3: MODEL CONFIGURATION TESTS
 # =============================================================================
 
-class TestNanoBananaEndpoint(unittest.TestCase):
-    """Test /media/nano-banana API endpoint"""
-
-    @classmethod
-    def setUpClass(cls):
-        """Set up test client"""
-        # Import here to avoid import issues
-        pass
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_endpoint_response_format(self, mock_upload, mock_genai):
-        """Test endpoint returns camelCase response"""
-        # This tests the response transformation in media.py
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-
-        mock_response = MagicMock()
-        mock_candidate = MagicMock()
-        mock_part = MagicMock()
-        mock_part.inline_data = MagicMock()
-        mock_part.inline_data.data = b"edited"
-        mock_part.inline_data.mime_type = "image/png"
-        mock_candidate.content.parts = [mock_part]
-        mock_response.candidates = [mock_candidate]
-        mock_genai.models.generate_content.return_value = mock_response
-
-        # Call the function directly (endpoint wraps this)
-        result = nano_banana(prompt="Test")
+@pytest.mark.parametrize('model', [
+    'imagen-4.0-generate-001',
+    'imagen-4.0-ultra-generate-001',
+    'imagen-4.0-fast-generate-001',
+    'imagen-3.0-generate-002',
+])
+def test_imagen_models(success_mocks, mock_settings, model):
+    """Test various Imagen model configurations"""
+    specced_genai, _ = success_mocks
+    mock_settings.return_value = {'imageModel': model}
 
-        # Verify snake_case response from function
-        self.assertIn('image_url', result)
-        self.assertIn('image_urls', result)
+    result = generate_image(prompt="Test")
 
-        # The endpoint transforms to:
-        # imageUrl, imageUrls (camelCase)
+    assert result['status'] == 'success'
+    assert specced_genai.models.generate_images.call_args.kwargs['model'] == model
 
 
-# =============================================================================
-# SECTION 4: RESPONSE CONSISTENCY TESTS
-# =============================================================================
-
-class TestResponseConsistency(unittest.TestCase):
-    """Test response format consistency across functions"""
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_generate_image_response_has_both_formats(self, mock_upload, mock_genai):
-        """Test generate_image returns both singular and array formats"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
-
-        mock_response = MagicMock()
-        mock_image = MagicMock()
-        mock_image.image.image_bytes = b"fake"
-        mock_response.generated_images = [mock_image]
-        mock_genai.models.generate_images.return_value = mock_response
-
-        result = generate_image(prompt="Test")
-
-        # URL format
-        self.assertIn('image_url', result)
-        self.assertIn('image_urls', result)
-        self.assertEqual(result['image_url'], result['image_urls'][0])
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_nano_banana_response_has_both_formats(self, mock_upload, mock_genai):
-        """Test nano_banana returns both singular and array formats"""
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-
-        mock_response = MagicMock()
-        mock_candidate = MagicMock()
-        mock_part = MagicMock()
-        mock_part.inline_data = MagicMock()
-        mock_part.inline_data.data = b"edited"
-        mock_part.inline_data.mime_type = "image/png"
-        mock_candidate.content.parts = [mock_part]
-        mock_response.candidates = [mock_candidate]
-        mock_genai.models.generate_content.return_value = mock_response
-
-        result = nano_banana(prompt="Test")
-
-        # URL format
-        self.assertIn('image_url', result)
-        self.assertIn('image_urls', result)
-        self.assertEqual(result['image_url'], result['image_urls'][0])
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_base64_response_has_both_formats(self, mock_upload, mock_genai):
-        """Test base64 fallback returns both singular and array formats"""
-        mock_upload.return_value = ""  # Force base64
-
-        mock_response = MagicMock()
-        mock_image = MagicMock()
-        mock_image.image.image_bytes = b"fake"
-        mock_response.generated_images = [mock_image]
-        mock_genai.models.generate_images.return_value = mock_response
-
-        result = generate_image(prompt="Test")
-
-        # Base64 format
-        self.assertIn('image_data', result)
-        self.assertIn('image_data_list', result)
-        self.assertEqual(result['image_data'], result['image_data_list'][0])
+def test_nano_banana_model(specced_genai, mock_upload, mock_settings):
+    """Test Nano Banana uses correct model"""
+    mock_settings.return_value = {'imageEditModel': 'gemini-2.5-flash-preview-05-20'}
+    mock_upload.return_value = IMAGE_URL
+    specced_genai.models.generate_content.return_value = make_nano_banana_response()
 
+    result = nano_banana(prompt="Test")
 
-# =============================================================================
-# SECTION 5: MODEL CONFIGURATION TESTS
-# =============================================================================
-
-class TestModelConfiguration(unittest.TestCase):
-    """Test model selection and configuration"""
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    @patch('tools.media_tools.get_settings_context')
-    def test_imagen_models(self, mock_settings, mock_upload, mock_genai):
-        """Test various Imagen model configurations"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
-
-        mock_response = MagicMock()
-        mock_image = MagicMock()
-        mock_image.image.image_bytes = b"fake"
-        mock_response.generated_images = [mock_image]
-        mock_genai.models.generate_images.return_value = mock_response
-
-        imagen_models = [
-            'imagen-4.0-generate-001',
-            'imagen-4.0-ultra-generate-001',
-            'imagen-4.0-fast-generate-001',
-            'imagen-3.0-generate-002'
-        ]
-
-        for model in imagen_models:
-            mock_settings.return_value = {'imageModel': model}
-            result = generate_image(prompt="Test")
-            self.assertEqual(result['status'], 'success')
-            call_args = mock_genai.models.generate_images.call_args
-            self.assertEqual(call_args[1]['model'], model)
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    @patch('tools.media_tools.get_settings_context')
-    def test_nano_banana_model(self, mock_settings, mock_upload, mock_genai):
-        """Test Nano Banana uses correct model"""
-        mock_settings.return_value = {'imageEditModel': 'gemini-2.5-flash-preview-05-20'}
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-
-        mock_response = MagicMock()
-        mock_candidate = MagicMock()
-        mock_part = MagicMock()
-        mock_part.inline_data = MagicMock()
-        mock_part.inline_data.data = b"edited"
-        mock_part.inline_data.mime_type = "image/png"
-        mock_candidate.content.parts = [mock_part]
-        mock_response.candidates = [mock_candidate]
-        mock_genai.models.generate_content.return_value = mock_response
-
-        result = nano_banana(prompt="Test")
-
-        self.assertEqual(result['status'], 'success')
-        call_args = mock_genai.models.generate_content.call_args
-        self.assertEqual(call_args[1]['model'], 'gemini-2.5-flash-preview-05-20')
-
-
-if __name__ == '__main__':
-    unittest.main()
+    assert result['status'] == 'success'
+    call_args = specced_genai.models.generate_content.call_args
+    assert call_args.kwargs['model'] == 'gemini-2.5-flash-preview-05-20'
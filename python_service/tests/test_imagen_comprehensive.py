@@ -1,61 +1,80 @@
+import base64
 import unittest
-from unittest.mock import MagicMock, patch
-import sys
-import os
-
-# Add python_service to path
-sys.path.insert(0,(os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))))
-
-# Mock firebase_admin before importing media_tools
-sys.modules['firebase_admin'] = MagicMock()
-sys.modules['firebase_admin.storage'] = MagicMock()
-sys.modules['firebase_admin.credentials'] = MagicMock()
+from unittest.mock import patch
+from types import SimpleNamespace
 
+from tools import media_tools as mt
 from tools.media_tools import generate_image
 from tools.media_tools import nano_banana
+from _mock_fixtures import make_genai_client, make_imagen_response, make_nano_banana_response
+
+
+STORAGE_URL = "https://storage.example.com/image.png"
+
+# Base64 inputs for the Nano Banana tests, encoded once at import.
+# reference_images is a comma-separated string.
+_REF_IMAGES = ",".join(base64.b64encode(x).decode('utf-8') for x in (b"ref1", b"ref2", b"ref3"))
+_IMAGE_DATA = base64.b64encode(b"original").decode('utf-8')
+_MASK_DATA = base64.b64encode(b"mask").decode('utf-8')
+
+
+class _MockedMediaToolsCase(unittest.TestCase):
+    """Base case that patches the genai client and storage upload"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Patch the genai client and storage upload once for the class"""
+        genai_patcher = patch.object(mt, 'genai_client', new=make_genai_client())
+        cls.mock_genai = genai_patcher.start()
+        cls.addClassCleanup(genai_patcher.stop)
+        upload_patcher = patch.object(mt, 'upload_to_storage')
+        cls.mock_upload = upload_patcher.start()
+        cls.addClassCleanup(upload_patcher.stop)
+
+    def setUp(self):
+        """Clear calls and configured results, then restore the default upload URL"""
+        self.mock_genai.reset_mock(return_value=True, side_effect=True)
+        self.mock_upload.reset_mock(return_value=True, side_effect=True)
+        self.mock_upload.return_value = STORAGE_URL
+
 
-class TestImagenComprehensive(unittest.TestCase):
+class TestImagenComprehensive(_MockedMediaToolsCase):
     """Comprehensive tests for all Imagen 4.0 features"""
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_aspect_ratio_support(self, mock_upload, mock_genai):
-        """Test different aspect ratio options"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
+    @classmethod
+    def setUpClass(cls):
+        """Patch media_tools and build the shared single-image response"""
+        super().setUpClass()
+        # Single-image response shared by tests that only read it
+        cls._imagen_resp = make_imagen_response()
 
-        mock_response = MagicMock()
-        mock_image = MagicMock()
-        mock_image.image.image_bytes = b"fake_image_data"
-        mock_response.generated_images = [mock_image]
-        mock_genai.models.generate_images.return_value = mock_response
+    def test_aspect_ratio_support(self):
+        """Test different aspect ratio options"""
+        gi = self.mock_genai.models.generate_images
+        gi.return_value = self._imagen_resp
 
         # Test different aspect ratios
         aspect_ratios = ['1:1', '16:9', '9:16', '4:3', '3:2']
         for ratio in aspect_ratios:
-            result = generate_image(
-                prompt="Test image",
-                aspect_ratio=ratio
-            )
-
-            self.assertEqual(result['status'], 'success')
-            call_args = mock_genai.models.generate_images.call_args
-            self.assertEqual(call_args[1]['config']['aspect_ratio'], ratio)
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_multiple_images_generation(self, mock_upload, mock_genai):
+            with self.subTest(ratio=ratio):
+                # Keep mock_calls from growing across iterations; the
+                # response and upload URL set up above are kept
+                gi.reset_mock(return_value=False, side_effect=False)
+                self.mock_upload.reset_mock()
+                result = generate_image(
+                    prompt="Test image",
+                    aspect_ratio=ratio
+                )
+
+                self.assertEqual(result['status'], 'success')
+                self.assertEqual(gi.call_args.kwargs['config']['aspect_ratio'], ratio)
+
+    def test_multiple_images_generation(self):
         """Test generating multiple images at once"""
-        mock_upload.return_value = ""  # Force base64
+        self.mock_upload.return_value = ""  # Force base64
 
         # Create 4 mock images
-        mock_response = MagicMock()
-        mock_images = []
-        for i in range(4):
-            mock_image = MagicMock()
-            mock_image.image.image_bytes = f"fake_image_{i}".encode()
-            mock_images.append(mock_image)
-        mock_response.generated_images = mock_images
-        mock_genai.models.generate_images.return_value = mock_response
+        self.mock_genai.models.generate_images.return_value = make_imagen_response(4)
 
         result = generate_image(
             prompt="Generate variations",
@@ -67,21 +86,12 @@ class TestImagenComprehensive(unittest.TestCase):
         self.assertEqual(len(result['image_data_list']), 4)
 
         # Verify config
-        call_args = mock_genai.models.generate_images.call_args
+        call_args = self.mock_genai.models.generate_images.call_args
         self.assertEqual(call_args[1]['config']['number_of_images'], 4)
 
-
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_person_generation_control(self, mock_upload, mock_genai):
+    def test_person_generation_control(self):
         """Test person generation parameter"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
-
-        mock_response = MagicMock()
-        mock_image = MagicMock()
-        mock_image.image.image_bytes = b"fake_image_data"
-        mock_response.generated_images = [mock_image]
-        mock_genai.models.generate_images.return_value = mock_response
+        self.mock_genai.models.generate_images.return_value = self._imagen_resp
 
         result = generate_image(
             prompt="People at a party",
@@ -89,20 +99,12 @@ class TestImagenComprehensive(unittest.TestCase):
         )
 
         self.assertEqual(result['status'], 'success')
-        call_args = mock_genai.models.generate_images.call_args
+        call_args = self.mock_genai.models.generate_images.call_args
         self.assertEqual(call_args[1]['config']['person_generation'], 'allow_all')
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_all_parameters_combined(self, mock_upload, mock_genai):
+    def test_all_parameters_combined(self):
         """Test using all parameters together"""
-        mock_upload.return_value = "https://storage.example.com/image.png"
-
-        mock_response = MagicMock()
-        mock_image = MagicMock()
-        mock_image.image.image_bytes = b"fake_image_data"
-        mock_response.generated_images = [mock_image]
-        mock_genai.models.generate_images.return_value = mock_response
+        self.mock_genai.models.generate_images.return_value = self._imagen_resp
 
         result = generate_image(
             prompt="Professional portrait",
@@ -112,7 +114,7 @@ class TestImagenComprehensive(unittest.TestCase):
         )
 
         self.assertEqual(result['status'], 'success')
-        call_args = mock_genai.models.generate_images.call_args
+        call_args = self.mock_genai.models.generate_images.call_args
         config = call_args[1]['config']
 
         self.assertEqual(config['aspect_ratio'], '3:4')
@@ -120,32 +122,33 @@ class TestImagenComprehensive(unittest.TestCase):
         self.assertEqual(config['person_generation'], 'allow_adult')
 
 
-class TestNanoBananaComprehensive(unittest.TestCase):
+class TestNanoBananaComprehensive(_MockedMediaToolsCase):
     """Comprehensive tests for Nano Banana (Imagen 3) image editing"""
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    @patch('tools.media_tools.requests')
-    def test_single_image_editing(self, mock_requests, mock_upload, mock_genai):
+    @classmethod
+    def setUpClass(cls):
+        """Patch media_tools and build the shared edited-image response"""
+        super().setUpClass()
+        # Edited-image response shared by tests that only read it
+        cls._nano_resp = make_nano_banana_response(b"edited_image")
+
+    def setUp(self):
+        """Reset the shared mocks and stub out image downloads"""
+        super().setUp()
+
+        # Plain attribute swap; nano_banana only reads content, headers
+        # and raise_for_status from the download
+        download = SimpleNamespace(
+            content=b"original_image",
+            headers={'Content-Type': 'image/png'},
+            raise_for_status=lambda: None,
+        )
+        self.addCleanup(setattr, mt, 'requests', mt.requests)
+        mt.requests = SimpleNamespace(get=lambda *args, **kwargs: download)
+
+    def test_single_image_editing(self):
         """Test basic image editing with single image"""
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-
-        # Mock image download
-        mock_response_img = MagicMock()
-        mock_response_img.content = b"original_image"
-        mock_response_img.headers = {'Content-Type': 'image/png'}
-        mock_requests.get.return_value = mock_response_img
-
-        # Mock genai response
-        mock_response = MagicMock()
-        mock_candidate = MagicMock()
-        mock_part = MagicMock()
-        mock_part.inline_data = MagicMock()
-        mock_part.inline_data.data = b"edited_image"
-        mock_part.inline_data.mime_type = "image/png"
-        mock_candidate.content.parts = [mock_part]
-        mock_response.candidates = [mock_candidate]
-        mock_genai.models.generate_content.return_value = mock_response
+        self.mock_genai.models.generate_content.return_value = self._nano_resp
 
         result = nano_banana(
             prompt="Make the sky blue",
@@ -154,73 +157,31 @@ class TestNanoBananaComprehensive(unittest.TestCase):
 
         self.assertEqual(result['status'], 'success')
         self.assertIn('image_url', result)
-        mock_genai.models.generate_content.assert_called_once()
+        self.assertEqual(self.mock_genai.models.generate_content.call_count, 1)
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_multi_image_composition(self, mock_upload, mock_genai):
+    def test_multi_image_composition(self):
         """Test multi-image composition with reference images"""
-        mock_upload.return_value = "https://storage.example.com/composed.png"
-
-        # Mock genai response
-        mock_response = MagicMock()
-        mock_candidate = MagicMock()
-        mock_part = MagicMock()
-        mock_part.inline_data = MagicMock()
-        mock_part.inline_data.data = b"composed_image"
-        mock_part.inline_data.mime_type = "image/png"
-        mock_candidate.content.parts = [mock_part]
-        mock_response.candidates = [mock_candidate]
-        mock_genai.models.generate_content.return_value = mock_response
-
-        import base64
-        # reference_images is now a comma-separated string
-        ref_images = ",".join([
-            base64.b64encode(b"ref1").decode('utf-8'),
-            base64.b64encode(b"ref2").decode('utf-8'),
-            base64.b64encode(b"ref3").decode('utf-8')
-        ])
+        self.mock_genai.models.generate_content.return_value = self._nano_resp
 
         result = nano_banana(
             prompt="Combine these elements into one image",
-            reference_images=ref_images
+            reference_images=_REF_IMAGES
         )
 
         self.assertEqual(result['status'], 'success')
         # Should have called with multiple image parts
-        call_args = mock_genai.models.generate_content.call_args
+        call_args = self.mock_genai.models.generate_content.call_args
         self.assertIsNotNone(call_args)
 
-    @patch('tools.media_tools.genai_client')
-    @patch('tools.media_tools.upload_to_storage')
-    def test_mask_based_editing(self, mock_upload, mock_genai):
+    def test_mask_based_editing(self):
         """Test mask-based editing"""
-        mock_upload.return_value = "https://storage.example.com/edited.png"
-
-        # Mock genai response
-        mock_response = MagicMock()
-        mock_candidate = MagicMock()
-        mock_part = MagicMock()
-        mock_part.inline_data = MagicMock()
-        mock_part.inline_data.data = b"edited_image"
-        mock_part.inline_data.mime_type = "image/png"
-        mock_candidate.content.parts = [mock_part]
-        mock_response.candidates = [mock_candidate]
-        mock_genai.models.generate_content.return_value = mock_response
-
-        import base64
-        image_data = base64.b64encode(b"original").decode('utf-8')
-        mask_data = base64.b64encode(b"mask").decode('utf-8')
+        self.mock_genai.models.generate_content.return_value = self._nano_resp
 
         result = nano_banana(
             prompt="Replace the masked area with a tree",
-            image_url=image_data,
-            mask_url=mask_data
+            image_url=_IMAGE_DATA,
+            mask_url=_MASK_DATA
         )
 
         self.assertEqual(result['status'], 'success')
-        mock_genai.models.generate_content.assert_called_once()
-
-
-if __name__ == '__main__':
-    unittest.main()
+        self.assertEqual(self.mock_genai.models.generate_content.call_count, 1)
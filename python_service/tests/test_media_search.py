@@ -7,15 +7,16 @@ This module tests:
 - API Endpoints: FastAPI endpoints for media search/index
 """
 
+import contextlib
+import functools
+import importlib
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, Mock, MagicMock
+import pytest
 import os
 import sys
 import types
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 
 def setup_adk_mocks():
     """Set up ADK mocks to prevent import errors and test interference."""
@@ -95,33 +96,163 @@ def setup_adk_mocks():
 # Set up ADK mocks before any imports that might use them
 setup_adk_mocks()
 
+import services.media_search_service as media_search_module
+from services.media_search_service import (
+    MediaSearchService,
+    MediaSearchResult,
+    MediaSearchResponse,
+    MediaIndexResult,
+    get_media_search_service,
+)
+from tools.media_search_tools import search_media_library, search_images, search_videos
+from tools.team_tools import search_team_media, find_similar_media
+from models.requests import MediaSearchRequest, MediaIndexRequest
+from models.search_settings import SearchSettings, SearchMethod
+
+# Every test here is mock-only, and setUpModule patches the service module
+# for the whole file; under --dist loadgroup the file stays on one worker
+pytestmark = pytest.mark.xdist_group(name="media_search_mock_only")
+
+
+@functools.lru_cache(maxsize=1)
+def _query_generation_reset():
+    """reset_query_generation_agent, resolved on first use (None if missing).
+
+    Not imported at module level: at collection time google.adk is still the
+    fake from setup_adk_mocks(), and importing the agent module then would
+    bind it to the fake LlmAgent for the rest of the session.
+    """
+    try:
+        from agents.query_generation_agent import reset_query_generation_agent
+    except ImportError:
+        return None
+    return reset_query_generation_agent
+
+
+def _reset_query_generation_agent():
+    """Reset the query generation agent singleton, if the agent exists."""
+    reset = _query_generation_reset()
+    if reset is not None:
+        reset()
+
+
+# No test changes these, so they are patched once for the whole module
+_ENV_PATCHER = patch.dict(os.environ, {
+    'MOMENTUM_NEXT_PUBLIC_FIREBASE_PROJECT_ID': 'test-project',
+    'GOOGLE_CLOUD_PROJECT': 'test-project',
+    'MOMENTUM_SEARCH_LOCATION': 'global'
+})
+
+
+# One discoveryengine mock for the module; classes that build a real
+# MediaSearchService reset it in setUp. Patched on the module object
+# imported above, so the service module is only ever loaded once.
+_DE_PATCHER = patch.object(media_search_module, 'discoveryengine')
+mock_discoveryengine = None
+
+
+def setUpModule():
+    """Patch the project environment and discoveryengine for every test in the module."""
+    global mock_discoveryengine
+    _ENV_PATCHER.start()
+    mock_discoveryengine = _DE_PATCHER.start()
+
+
+def tearDownModule():
+    """Restore the original environment and discoveryengine."""
+    _DE_PATCHER.stop()
+    _ENV_PATCHER.stop()
+
+
+def reset_discoveryengine():
+    """Clear calls and configured return values left by the previous test."""
+    mock_discoveryengine.reset_mock(return_value=True, side_effect=True)
+
+
+# Error returned by both media search tools when no brand is in context
+_BRAND_REQUIRED_ERROR = (
+    "Brand ID required for media search. Please ensure user is authenticated."
+)
+
+
+# Firestore media item used for document conversion. Plain dict and lists,
+# like a real Firestore document; shared because no test mutates it.
+_SAMPLE_MEDIA = {
+    'id': 'media-123',
+    'brandId': 'brand-456',
+    'title': 'Test Image',
+    'description': 'A beautiful landscape',
+    'prompt': 'Generate a mountain scene',
+    'tags': ['nature', 'landscape'],
+    'type': 'image',
+    'source': 'ai-generated',
+    'url': 'https://example.com/image.jpg',
+    'thumbnailUrl': 'https://example.com/thumb.jpg',
+    'explainability': {
+        'summary': 'AI-generated landscape',
+        'brandElements': ['mountain', 'sky']
+    }
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _default_settings():
+    """Vertex AI search settings for brand-123, built once."""
+    return SearchSettings(
+        brand_id='brand-123',
+        search_method=SearchMethod.VERTEX_AI,
+        auto_index=True,
+        vertex_ai_enabled=True
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _unconfigured_service():
+    """MediaSearchService with no project, built once.
+
+    Mirrors what __init__ leaves behind when no project is configured; the
+    service returns early in that state, so sharing one instance is safe.
+    """
+    service = MediaSearchService.__new__(MediaSearchService)
+    service.project_id = None
+    service.location = 'global'
+    service.search_client = None
+    service.document_client = None
+    service.datastore_client = None
+    return service
+
+
+def _settings_service_mock():
+    """Search settings service stub returning the default settings."""
+    return types.SimpleNamespace(get_search_settings=lambda brand_id: _default_settings())
+
+
+def _stub_service(search_return):
+    """Media search service stub; only search is a Mock, for call assertions."""
+    return types.SimpleNamespace(search=Mock(return_value=search_return))
+
 
 class TestMediaSearchService(unittest.TestCase):
     """Test cases for the MediaSearchService class."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.env_patcher = patch.dict(os.environ, {
-            'MOMENTUM_NEXT_PUBLIC_FIREBASE_PROJECT_ID': 'test-project',
-            'GOOGLE_CLOUD_PROJECT': 'test-project',
-            'MOMENTUM_SEARCH_LOCATION': 'global'
-        })
-        self.env_patcher.start()
+    @classmethod
+    def setUpClass(cls):
+        """Return one shared set of mock Google credentials for the class."""
+        # media_search_service imports get_google_credentials by name, so
+        # patch it there rather than on config
+        credentials_patcher = patch.object(
+            media_search_module, 'get_google_credentials',
+            return_value=(MagicMock(), None),
+        )
+        credentials_patcher.start()
+        cls.addClassCleanup(credentials_patcher.stop)
 
-    def tearDown(self):
-        """Clean up after tests."""
-        self.env_patcher.stop()
+    def setUp(self):
+        """Reset the shared discoveryengine mock."""
+        reset_discoveryengine()
 
-    @patch('config.get_google_credentials')
-    @patch('services.media_search_service.discoveryengine')
-    def test_service_initialization(self, mock_discoveryengine, mock_get_credentials):
+    def test_service_initialization(self):
         """Test MediaSearchService initializes correctly."""
-        # Mock Google credentials
-        mock_credentials = MagicMock()
-        mock_get_credentials.return_value = (mock_credentials, None)
-        
-        from services.media_search_service import MediaSearchService
-
         service = MediaSearchService(project_id='test-project', location='global')
 
         self.assertEqual(service.project_id, 'test-project')
@@ -130,39 +261,24 @@ class TestMediaSearchService(unittest.TestCase):
         mock_discoveryengine.DocumentServiceClient.assert_called_once()
         mock_discoveryengine.DataStoreServiceClient.assert_called_once()
 
-    @patch('services.media_search_service.discoveryengine')
-    def test_get_datastore_id(self, mock_discoveryengine):
+    def test_get_datastore_id(self):
         """Test data store ID generation."""
-        from services.media_search_service import MediaSearchService
-
         service = MediaSearchService(project_id='test-project')
 
         # Test lowercase and hyphen conversion
         self.assertEqual(service._get_datastore_id('brand_123'), 'momentum-media-brand-123')
         self.assertEqual(service._get_datastore_id('BRAND_ABC'), 'momentum-media-brand-abc')
 
-    @patch('services.media_search_service.discoveryengine')
-    def test_get_datastore_path(self, mock_discoveryengine):
+    def test_get_datastore_path(self):
         """Test data store path generation."""
-        from services.media_search_service import MediaSearchService
-
         service = MediaSearchService(project_id='test-project', location='global')
         path = service._get_datastore_path('brand-123')
 
         self.assertEqual(path, 'projects/test-project/locations/global/dataStores/momentum-media-brand-123')
 
-    @patch('services.media_search_service.discoveryengine')
-    def test_search_missing_project(self, mock_discoveryengine):
+    def test_search_missing_project(self):
         """Test search returns empty results when project not configured."""
-        from services.media_search_service import MediaSearchService
-
-        # Create service with no project
-        service = MediaSearchService.__new__(MediaSearchService)
-        service.project_id = None
-        service.location = 'global'
-        service.search_client = None
-
-        result = service.search(
+        result = _unconfigured_service().search(
             brand_id='brand-123',
             query='blue images'
         )
@@ -170,70 +286,32 @@ class TestMediaSearchService(unittest.TestCase):
         self.assertEqual(result.results, [])
         self.assertEqual(result.total_count, 0)
 
-    @patch('services.media_search_service.discoveryengine')
-    def test_index_media_missing_project(self, mock_discoveryengine):
+    def test_index_media_missing_project(self):
         """Test index returns error when project not configured."""
-        from services.media_search_service import MediaSearchService
-
-        # Create service with no project
-        service = MediaSearchService.__new__(MediaSearchService)
-        service.project_id = None
-        service.document_client = None
-
-        result = service.index_media(
+        result = _unconfigured_service().index_media(
             brand_id='brand-123',
             media_items=[{'id': 'test-1', 'title': 'Test'}]
         )
 
         self.assertFalse(result.success)
-        self.assertIn('not configured', result.message)
+        self.assertEqual(result.message, 'Media Search service not configured')
 
-    @patch('config.get_google_credentials')
-    @patch('services.media_search_service.discoveryengine')
-    def test_index_media_empty_items(self, mock_discoveryengine, mock_get_credentials):
+    def test_index_media_empty_items(self):
         """Test index with empty media items."""
-        # Mock Google credentials
-        mock_credentials = MagicMock()
-        mock_get_credentials.return_value = (mock_credentials, None)
-        
-        from services.media_search_service import MediaSearchService
-
         service = MediaSearchService(project_id='test-project')
         result = service.index_media(brand_id='brand-123', media_items=[])
 
         self.assertTrue(result.success)
         self.assertEqual(result.indexed_count, 0)
-        self.assertIn('No media items', result.message)
+        self.assertEqual(result.message, 'No media items to index')
 
-    @patch('services.media_search_service.discoveryengine')
-    def test_media_to_document(self, mock_discoveryengine):
+    def test_media_to_document(self):
         """Test media item to Discovery Engine document conversion."""
-        from services.media_search_service import MediaSearchService
-
-        # Need to properly configure the mock Document to return real values
-        mock_doc_class = MagicMock()
-        mock_discoveryengine.Document = mock_doc_class
+        mock_doc_class = mock_discoveryengine.Document
 
         service = MediaSearchService(project_id='test-project')
 
-        media = {
-            'id': 'media-123',
-            'brandId': 'brand-456',
-            'title': 'Test Image',
-            'description': 'A beautiful landscape',
-            'prompt': 'Generate a mountain scene',
-            'tags': ['nature', 'landscape'],
-            'type': 'image',
-            'source': 'ai-generated',
-            'url': 'https://example.com/image.jpg',
-            'thumbnailUrl': 'https://example.com/thumb.jpg',
-            'explainability': {
-                'summary': 'AI-generated landscape',
-                'brandElements': ['mountain', 'sky']
-            }
-        }
-
-        doc = service._media_to_document(media)
+        service._media_to_document(_SAMPLE_MEDIA)
 
         # Verify Document was called with correct id
         call_kwargs = mock_doc_class.call_args[1]
@@ -242,22 +320,14 @@ class TestMediaSearchService(unittest.TestCase):
         content = call_kwargs['content']
         self.assertIsNotNone(content)
 
-    @patch('services.media_search_service.google_exceptions')
-    @patch('config.get_google_credentials')
-    @patch('services.media_search_service.discoveryengine')
-    def test_delete_media_not_found(self, mock_discoveryengine, mock_get_credentials, mock_google_exceptions):
+    @patch.object(media_search_module, 'google_exceptions')
+    def test_delete_media_not_found(self, mock_google_exceptions):
         """Test delete handles not found gracefully."""
-        # Mock Google credentials
-        mock_credentials = MagicMock()
-        mock_get_credentials.return_value = (mock_credentials, None)
-        
         # Mock Google exceptions
         not_found_exception = Exception('Not found')
         mock_google_exceptions.NotFound = type(not_found_exception)
         
-        from services.media_search_service import MediaSearchService
-
-        mock_doc_client = MagicMock()
+        mock_doc_client = Mock(spec=['delete_document'])
         mock_doc_client.delete_document.side_effect = mock_google_exceptions.NotFound('Not found')
         mock_discoveryengine.DocumentServiceClient.return_value = mock_doc_client
 
@@ -273,8 +343,6 @@ class TestMediaSearchDataClasses(unittest.TestCase):
 
     def test_media_search_result_creation(self):
         """Test MediaSearchResult dataclass creation."""
-        from services.media_search_service import MediaSearchResult
-
         result = MediaSearchResult(
             media_id='test-123',
             title='Test Title',
@@ -294,8 +362,6 @@ class TestMediaSearchDataClasses(unittest.TestCase):
 
     def test_media_search_response_creation(self):
         """Test MediaSearchResponse dataclass creation."""
-        from services.media_search_service import MediaSearchResponse, MediaSearchResult
-
         results = [
             MediaSearchResult(
                 media_id='test-1', title='Test 1', description='', media_type='image',
@@ -317,8 +383,6 @@ class TestMediaSearchDataClasses(unittest.TestCase):
 
     def test_media_index_result_creation(self):
         """Test MediaIndexResult dataclass creation."""
-        from services.media_search_service import MediaIndexResult
-
         result = MediaIndexResult(
             success=True,
             indexed_count=5,
@@ -336,185 +400,119 @@ class TestMediaSearchTools(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures."""
-        self.env_patcher = patch.dict(os.environ, {
-            'MOMENTUM_NEXT_PUBLIC_FIREBASE_PROJECT_ID': 'test-project'
-        })
-        self.env_patcher.start()
         # Reset query generation agent singleton for test isolation
-        try:
-            from agents.query_generation_agent import reset_query_generation_agent
-            reset_query_generation_agent()
-        except ImportError:
-            pass  # If function doesn't exist, continue
+        _reset_query_generation_agent()
 
     def tearDown(self):
         """Clean up after tests."""
-        self.env_patcher.stop()
         # Reset query generation agent singleton after test
-        try:
-            from agents.query_generation_agent import reset_query_generation_agent
-            reset_query_generation_agent()
-        except ImportError:
-            pass  # If function doesn't exist, continue
-
-    @patch('services.search_settings_service.get_search_settings_service')
-    @patch('agents.query_generation_agent.generate_search_queries_sync')
-    @patch('services.media_search_service.get_media_search_service')
-    @patch('tools.media_search_tools.get_brand_context')
-    def test_search_media_library_success(self, mock_get_brand_context, mock_get_service, mock_generate_queries, mock_get_settings_service):
-        """Test successful media library search."""
-        # Ensure mock is set up before importing
-        mock_get_brand_context.return_value = 'brand-123'
-        # Mock query generation to return single query (disable for tests)
-        mock_generate_queries.return_value = ['blue images']
-        
-        from tools.media_search_tools import search_media_library
-        from services.media_search_service import MediaSearchResponse, MediaSearchResult
-        from models.search_settings import SearchSettings, SearchMethod
-
-        mock_result = MediaSearchResponse(
-            results=[
-                MediaSearchResult(
-                    media_id='img-1', title='Blue Sky', description='Landscape',
-                    media_type='image', url='https://example.com/1.jpg',
-                    thumbnail_url='https://example.com/1-thumb.jpg',
-                    source='upload', tags=['nature'], relevance_score=0.95
-                )
-            ],
-            total_count=1,
-            query='blue images',
-            search_time_ms=25.0
-        )
-
-        mock_service = MagicMock()
-        mock_service.search.return_value = mock_result
-        mock_get_service.return_value = mock_service
-        
-        # Mock search settings service to return proper SearchSettings
-        mock_settings_service = MagicMock()
-        mock_settings = SearchSettings(
-            brand_id='brand-123',
-            search_method=SearchMethod.VERTEX_AI,
-            auto_index=True,
-            vertex_ai_enabled=True
-        )
-        mock_settings_service.get_search_settings.return_value = mock_settings
-        mock_get_settings_service.return_value = mock_settings_service
-
-        result = search_media_library(query='blue images', use_query_generation=False)
-
-        self.assertEqual(result['status'], 'success')
-        self.assertEqual(len(result['results']), 1)
-        self.assertEqual(result['results'][0]['title'], 'Blue Sky')
-        self.assertEqual(result['total_count'], 1)
+        _reset_query_generation_agent()
 
     def test_search_media_library_no_brand(self):
         """Test search fails without brand context."""
         # We need to patch where the function is imported, not where it's defined
         with patch('tools.media_search_tools.get_brand_context', return_value=None):
-            from tools.media_search_tools import search_media_library
-
             result = search_media_library(query='test query')
 
             self.assertEqual(result['status'], 'error')
-            self.assertIn('Brand ID required', result['error'])
+            self.assertEqual(result['error'], _BRAND_REQUIRED_ERROR)
 
-    @patch('services.search_settings_service.get_search_settings_service')
-    @patch('agents.query_generation_agent.generate_search_queries_sync')
-    @patch('services.media_search_service.get_media_search_service')
-    @patch('tools.media_search_tools.get_brand_context')
-    def test_search_images_filters_by_type(self, mock_get_brand_context, mock_get_service, mock_generate_queries, mock_get_settings_service):
-        """Test search_images filters by image type."""
-        # Ensure mock is set up before importing
-        mock_get_brand_context.return_value = 'brand-123'
-        # Mock query generation to return single query (disable for tests)
-        mock_generate_queries.return_value = ['blue sky']
-        
-        from tools.media_search_tools import search_images
-        from services.media_search_service import MediaSearchResponse
-        from models.search_settings import SearchSettings, SearchMethod
-        mock_service = MagicMock()
-        mock_service.search.return_value = MediaSearchResponse(
-            results=[], total_count=0, query='test', search_time_ms=10.0
-        )
-        mock_get_service.return_value = mock_service
-        
-        # Mock search settings service to return proper SearchSettings
-        mock_settings_service = MagicMock()
-        mock_settings = SearchSettings(
-            brand_id='brand-123',
-            search_method=SearchMethod.VERTEX_AI,
-            auto_index=True,
-            vertex_ai_enabled=True
-        )
-        mock_settings_service.get_search_settings.return_value = mock_settings
-        mock_get_settings_service.return_value = mock_settings_service
 
-        search_images(query='blue sky', use_query_generation=False)
+# -------------------------------------------------------------------------
+# Media search tool fixtures
+# -------------------------------------------------------------------------
 
-        # Verify media_type filter was passed
-        call_args = mock_service.search.call_args
-        self.assertEqual(call_args[1]['media_type'], 'image')
+@pytest.fixture
+def fresh_query_generation_agent():
+    """Reset the query generation agent singleton before and after the test"""
+    _reset_query_generation_agent()
+    yield
+    _reset_query_generation_agent()
 
-    @patch('services.search_settings_service.get_search_settings_service')
-    @patch('agents.query_generation_agent.generate_search_queries_sync')
-    @patch('services.media_search_service.get_media_search_service')
-    @patch('tools.media_search_tools.get_brand_context')
-    def test_search_videos_filters_by_type(self, mock_get_brand_context, mock_get_service, mock_generate_queries, mock_get_settings_service):
-        """Test search_videos filters by video type."""
-        # Ensure mock is set up before importing
-        mock_get_brand_context.return_value = 'brand-123'
-        # Mock query generation to return single query (disable for tests)
-        mock_generate_queries.return_value = ['product demo']
-        
-        from tools.media_search_tools import search_videos
-        from services.media_search_service import MediaSearchResponse
-        from models.search_settings import SearchSettings, SearchMethod
-        mock_service = MagicMock()
-        mock_service.search.return_value = MediaSearchResponse(
-            results=[], total_count=0, query='test', search_time_ms=10.0
-        )
-        mock_get_service.return_value = mock_service
-        
-        # Mock search settings service to return proper SearchSettings
-        mock_settings_service = MagicMock()
-        mock_settings = SearchSettings(
-            brand_id='brand-123',
-            search_method=SearchMethod.VERTEX_AI,
-            auto_index=True,
-            vertex_ai_enabled=True
-        )
-        mock_settings_service.get_search_settings.return_value = mock_settings
-        mock_get_settings_service.return_value = mock_settings_service
 
-        search_videos(query='product demo', use_query_generation=False)
+@pytest.fixture
+def mock_brand_context(monkeypatch):
+    """Resolve brand-123 as the current brand for tools.media_search_tools"""
+    mock = MagicMock(return_value='brand-123')
+    monkeypatch.setattr('tools.media_search_tools.get_brand_context', mock)
+    return mock
 
-        # Verify media_type filter was passed
-        call_args = mock_service.search.call_args
-        self.assertEqual(call_args[1]['media_type'], 'video')
 
+@pytest.fixture
+def mock_media_service(monkeypatch):
+    """Media search service returning one 'Blue Sky' image.
 
-class TestTeamMediaSearchTools(unittest.TestCase):
-    """Test cases for team tools for media search."""
+    search records its keyword arguments in search_kwargs instead of
+    going through MagicMock call recording.
+    """
+    response = MediaSearchResponse(
+        results=[
+            MediaSearchResult(
+                media_id='img-1', title='Blue Sky', description='Landscape',
+                media_type='image', url='https://example.com/1.jpg',
+                thumbnail_url='https://example.com/1-thumb.jpg',
+                source='upload', tags=['nature'], relevance_score=0.95
+            )
+        ],
+        total_count=1,
+        query='blue images',
+        search_time_ms=25.0
+    )
+    search_kwargs = {}
+    mock_service = types.SimpleNamespace(
+        search=lambda **kwargs: search_kwargs.update(kwargs) or response,
+        search_kwargs=search_kwargs,
+    )
+    monkeypatch.setattr('services.media_search_service.get_media_search_service',
+                        Mock(return_value=mock_service))
+    return mock_service
+
+
+@pytest.fixture
+def mock_settings_service(monkeypatch):
+    """Search settings service returning the default Vertex AI settings"""
+    mock_service = _settings_service_mock()
+    monkeypatch.setattr('services.search_settings_service.get_search_settings_service',
+                        Mock(return_value=mock_service))
+    return mock_service
+
+
+@pytest.fixture
+def mock_query_gen(monkeypatch):
+    """Query generation returning the single test query"""
+    mock = MagicMock(return_value=['blue images'])
+    monkeypatch.setattr('agents.query_generation_agent.generate_search_queries_sync', mock)
+    return mock
+
+
+@pytest.mark.parametrize("search_fn, expected_type", [
+    pytest.param(search_media_library, None, id="library"),
+    pytest.param(search_images, 'image', id="images"),
+    pytest.param(search_videos, 'video', id="videos"),
+])
+def test_search_tools_filter_by_type(fresh_query_generation_agent,
+                                     mock_brand_context, mock_media_service,
+                                     mock_settings_service, mock_query_gen,
+                                     search_fn, expected_type):
+    """Each search tool returns formatted results and passes its media_type filter."""
+    result = search_fn(query='blue images', use_query_generation=False)
+
+    assert result['status'] == 'success'
+    assert len(result['results']) == 1
+    assert result['results'][0]['title'] == 'Blue Sky'
+    assert result['total_count'] == 1
+
+    # Verify media_type filter was passed
+    assert mock_media_service.search_kwargs['media_type'] == expected_type
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.env_patcher = patch.dict(os.environ, {
-            'MOMENTUM_NEXT_PUBLIC_FIREBASE_PROJECT_ID': 'test-project'
-        })
-        self.env_patcher.start()
 
-    def tearDown(self):
-        """Clean up after tests."""
-        self.env_patcher.stop()
+class TestTeamMediaSearchTools(unittest.TestCase):
+    """Test cases for team tools for media search."""
 
     @patch('services.media_search_service.get_media_search_service')
     @patch('tools.team_tools.get_brand_context')
     def test_search_team_media_success(self, mock_get_brand_context, mock_get_service):
         """Test successful team media search."""
-        from tools.team_tools import search_team_media
-        from services.media_search_service import MediaSearchResponse, MediaSearchResult
-
         mock_get_brand_context.return_value = 'brand-123'
 
         mock_result = MediaSearchResponse(
@@ -531,8 +529,7 @@ class TestTeamMediaSearchTools(unittest.TestCase):
             search_time_ms=30.0
         )
 
-        mock_service = MagicMock()
-        mock_service.search.return_value = mock_result
+        mock_service = _stub_service(mock_result)
         mock_get_service.return_value = mock_service
 
         result = search_team_media(query='product demo')
@@ -545,25 +542,19 @@ class TestTeamMediaSearchTools(unittest.TestCase):
         """Test team media search fails without brand context."""
         # We need to patch where the function is imported, not where it's defined
         with patch('tools.team_tools.get_brand_context', return_value=None):
-            from tools.team_tools import search_team_media
-
             result = search_team_media(query='test query')
 
             self.assertEqual(result['status'], 'error')
-            self.assertIn('Brand ID required', result['error'])
+            self.assertEqual(result['error'], _BRAND_REQUIRED_ERROR)
 
     @patch('services.media_search_service.get_media_search_service')
     @patch('tools.team_tools.get_brand_context')
     def test_search_team_media_with_source_filters(self, mock_get_brand_context, mock_get_service):
         """Test team media search with source filters."""
-        from tools.team_tools import search_team_media
-        from services.media_search_service import MediaSearchResponse
-
         mock_get_brand_context.return_value = 'brand-123'
-        mock_service = MagicMock()
-        mock_service.search.return_value = MediaSearchResponse(
+        mock_service = _stub_service(MediaSearchResponse(
             results=[], total_count=0, query='test', search_time_ms=10.0
-        )
+        ))
         mock_get_service.return_value = mock_service
 
         # Test with only uploads enabled
@@ -581,9 +572,6 @@ class TestTeamMediaSearchTools(unittest.TestCase):
     @patch('tools.team_tools.get_brand_context')
     def test_find_similar_media(self, mock_get_brand_context, mock_get_service):
         """Test find similar media functionality."""
-        from tools.team_tools import find_similar_media
-        from services.media_search_service import MediaSearchResponse, MediaSearchResult
-
         mock_get_brand_context.return_value = 'brand-123'
 
         mock_result = MediaSearchResponse(
@@ -601,8 +589,7 @@ class TestTeamMediaSearchTools(unittest.TestCase):
             search_time_ms=20.0
         )
 
-        mock_service = MagicMock()
-        mock_service.search.return_value = mock_result
+        mock_service = _stub_service(mock_result)
         mock_get_service.return_value = mock_service
 
         result = find_similar_media(media_id='original-123')
@@ -611,39 +598,24 @@ class TestTeamMediaSearchTools(unittest.TestCase):
         self.assertEqual(result['reference_id'], 'original-123')
 
 
+@pytest.mark.parametrize("module_name, names", [
+    ('tools.media_search_tools',
+     ['search_media_library', 'search_images', 'search_videos', 'index_brand_media']),
+    ('tools.team_tools', ['search_team_media', 'find_similar_media']),
+    ('models.requests', ['MediaSearchRequest', 'MediaIndexRequest']),
+])
+def test_media_search_names_importable(module_name, names):
+    """Test that the media search tools and request models can be imported."""
+    module = importlib.import_module(module_name)
+    for name in names:
+        assert callable(getattr(module, name)), f"{module_name}.{name}"
+
+
 class TestMediaSearchToolIntegration(unittest.TestCase):
     """Test tool registration in the agent."""
 
-    def test_media_search_tools_importable(self):
-        """Test that media search tools can be imported."""
-        try:
-            from tools.media_search_tools import (
-                search_media_library,
-                search_images,
-                search_videos,
-                index_brand_media
-            )
-            self.assertTrue(callable(search_media_library))
-            self.assertTrue(callable(search_images))
-            self.assertTrue(callable(search_videos))
-            self.assertTrue(callable(index_brand_media))
-        except ImportError as e:
-            self.fail(f"Failed to import media search tools: {e}")
-
-    def test_team_media_tools_importable(self):
-        """Test that team media tools can be imported."""
-        try:
-            from tools.team_tools import search_team_media, find_similar_media
-            self.assertTrue(callable(search_team_media))
-            self.assertTrue(callable(find_similar_media))
-        except ImportError as e:
-            self.fail(f"Failed to import team media tools: {e}")
-
     def test_tool_docstrings(self):
         """Test that tools have proper docstrings for agent use."""
-        from tools.media_search_tools import search_media_library, search_images, search_videos
-        from tools.team_tools import search_team_media
-
         # Check docstrings contain key information
         self.assertIsNotNone(search_media_library.__doc__)
         self.assertIn('search', search_media_library.__doc__.lower())
@@ -661,19 +633,8 @@ class TestMediaSearchToolIntegration(unittest.TestCase):
 class TestMediaSearchAPI(unittest.TestCase):
     """Test FastAPI endpoints for media search."""
 
-    def test_request_models_importable(self):
-        """Test that request models can be imported."""
-        try:
-            from models.requests import MediaSearchRequest, MediaIndexRequest
-            self.assertIsNotNone(MediaSearchRequest)
-            self.assertIsNotNone(MediaIndexRequest)
-        except ImportError as e:
-            self.fail(f"Failed to import request models: {e}")
-
     def test_media_search_request_validation(self):
         """Test MediaSearchRequest validation."""
-        from models.requests import MediaSearchRequest
-
         # Valid request
         request = MediaSearchRequest(
             brand_id='brand-123',
@@ -688,8 +649,6 @@ class TestMediaSearchAPI(unittest.TestCase):
 
     def test_media_index_request_validation(self):
         """Test MediaIndexRequest validation."""
-        from models.requests import MediaIndexRequest
-
         # Valid request
         request = MediaIndexRequest(
             brand_id='brand-123',
@@ -705,14 +664,14 @@ class TestMediaSearchAPI(unittest.TestCase):
 class TestMediaSearchServiceSingleton(unittest.TestCase):
     """Test singleton pattern for MediaSearchService."""
 
-    @patch('services.media_search_service.discoveryengine')
-    def test_get_media_search_service_singleton(self, mock_discoveryengine):
-        """Test that get_media_search_service returns singleton."""
-        from services.media_search_service import get_media_search_service, _media_search_service
-        import services.media_search_service as module
+    def setUp(self):
+        """Reset the shared discoveryengine mock."""
+        reset_discoveryengine()
 
+    def test_get_media_search_service_singleton(self):
+        """Test that get_media_search_service returns singleton."""
         # Reset singleton
-        module._media_search_service = None
+        media_search_module._media_search_service = None
 
         service1 = get_media_search_service()
         service2 = get_media_search_service()
@@ -724,23 +683,23 @@ class TestMediaSearchIntegration(unittest.TestCase):
     """Integration tests for media search across all features."""
 
     def setUp(self):
-        """Set up test fixtures."""
-        self.env_patcher = patch.dict(os.environ, {
-            'MOMENTUM_NEXT_PUBLIC_FIREBASE_PROJECT_ID': 'test-project',
-            'GOOGLE_CLOUD_PROJECT': 'test-project',
-            'MOMENTUM_SEARCH_LOCATION': 'global'
-        })
-        self.env_patcher.start()
+        """Reset discoveryengine and patch the media search tool dependencies."""
+        reset_discoveryengine()
+        self._stack = contextlib.ExitStack()
+        self.mock_get_brand_context = self._stack.enter_context(
+            patch('tools.media_search_tools.get_brand_context'))
+        self.mock_get_service = self._stack.enter_context(
+            patch('services.media_search_service.get_media_search_service'))
+        self.mock_get_settings_service = self._stack.enter_context(
+            patch('services.search_settings_service.get_search_settings_service'))
 
     def tearDown(self):
-        """Clean up after tests."""
-        self.env_patcher.stop()
+        """Undo the setUp patches."""
+        self._stack.close()
 
     def test_agent_tools_include_media_search(self):
         """Test that momentum agent includes media search tools."""
         # Just test the tools can be imported and have correct signatures
-        from tools.media_search_tools import search_media_library, search_images, search_videos
-        from tools.team_tools import search_team_media, find_similar_media
 
         # All should be callable
         self.assertTrue(callable(search_media_library))
@@ -749,15 +708,9 @@ class TestMediaSearchIntegration(unittest.TestCase):
         self.assertTrue(callable(search_team_media))
         self.assertTrue(callable(find_similar_media))
 
-    @patch('services.search_settings_service.get_search_settings_service')
-    @patch('services.media_search_service.get_media_search_service')
-    @patch('tools.media_search_tools.get_brand_context')
-    def test_media_library_search_flow(self, mock_get_brand_context, mock_get_service, mock_get_settings_service):
+    def test_media_library_search_flow(self):
         """Test complete search flow for Media Library."""
-        from tools.media_search_tools import search_media_library
-        from services.media_search_service import MediaSearchResponse, MediaSearchResult
-
-        mock_get_brand_context.return_value = 'brand-123'
+        self.mock_get_brand_context.return_value = 'brand-123'
 
         mock_result = MediaSearchResponse(
             results=[
@@ -779,21 +732,10 @@ class TestMediaSearchIntegration(unittest.TestCase):
             search_time_ms=45.0
         )
 
-        mock_service = MagicMock()
-        mock_service.search.return_value = mock_result
-        mock_get_service.return_value = mock_service
+        mock_service = _stub_service(mock_result)
+        self.mock_get_service.return_value = mock_service
         
-        # Mock search settings service to return proper SearchSettings
-        from models.search_settings import SearchSettings, SearchMethod
-        mock_settings_service = MagicMock()
-        mock_settings = SearchSettings(
-            brand_id='brand-123',
-            search_method=SearchMethod.VERTEX_AI,
-            auto_index=True,
-            vertex_ai_enabled=True
-        )
-        mock_settings_service.get_search_settings.return_value = mock_settings
-        mock_get_settings_service.return_value = mock_settings_service
+        self.mock_get_settings_service.return_value = _settings_service_mock()
 
         result = search_media_library(query='product photos', limit=10, use_query_generation=False)
 
@@ -802,15 +744,9 @@ class TestMediaSearchIntegration(unittest.TestCase):
         self.assertEqual(result['results'][0]['title'], 'Product Photo')
         self.assertEqual(result['results'][1]['source'], 'brand-soul')
 
-    @patch('services.search_settings_service.get_search_settings_service')
-    @patch('services.media_search_service.get_media_search_service')
-    @patch('tools.media_search_tools.get_brand_context')
-    def test_image_gallery_search_flow(self, mock_get_brand_context, mock_get_service, mock_get_settings_service):
+    def test_image_gallery_search_flow(self):
         """Test search flow specifically for Image Gallery."""
-        from tools.media_search_tools import search_images
-        from services.media_search_service import MediaSearchResponse, MediaSearchResult
-
-        mock_get_brand_context.return_value = 'brand-456'
+        self.mock_get_brand_context.return_value = 'brand-456'
 
         mock_result = MediaSearchResponse(
             results=[
@@ -826,21 +762,19 @@ class TestMediaSearchIntegration(unittest.TestCase):
             search_time_ms=30.0
         )
 
-        mock_service = MagicMock()
-        mock_service.search.return_value = mock_result
-        mock_get_service.return_value = mock_service
+        mock_service = _stub_service(mock_result)
+        self.mock_get_service.return_value = mock_service
         
         # Mock search settings service to return proper SearchSettings
-        from models.search_settings import SearchSettings, SearchMethod
-        mock_settings_service = MagicMock()
         mock_settings = SearchSettings(
             brand_id='brand-456',
             search_method=SearchMethod.VERTEX_AI,
             auto_index=True,
             vertex_ai_enabled=True
         )
-        mock_settings_service.get_search_settings.return_value = mock_settings
-        mock_get_settings_service.return_value = mock_settings_service
+        self.mock_get_settings_service.return_value = types.SimpleNamespace(
+            get_search_settings=lambda brand_id: mock_settings
+        )
 
         result = search_images(query='landscape', source='ai-generated', use_query_generation=False)
 
@@ -852,15 +786,9 @@ class TestMediaSearchIntegration(unittest.TestCase):
         call_args = mock_service.search.call_args
         self.assertEqual(call_args[1]['media_type'], 'image')
 
-    @patch('services.search_settings_service.get_search_settings_service')
-    @patch('services.media_search_service.get_media_search_service')
-    @patch('tools.media_search_tools.get_brand_context')
-    def test_video_gallery_search_flow(self, mock_get_brand_context, mock_get_service, mock_get_settings_service):
+    def test_video_gallery_search_flow(self):
         """Test search flow specifically for Video Gallery."""
-        from tools.media_search_tools import search_videos
-        from services.media_search_service import MediaSearchResponse, MediaSearchResult
-
-        mock_get_brand_context.return_value = 'brand-789'
+        self.mock_get_brand_context.return_value = 'brand-789'
 
         mock_result = MediaSearchResponse(
             results=[
@@ -882,9 +810,8 @@ class TestMediaSearchIntegration(unittest.TestCase):
             search_time_ms=35.0
         )
 
-        mock_service = MagicMock()
-        mock_service.search.return_value = mock_result
-        mock_get_service.return_value = mock_service
+        mock_service = _stub_service(mock_result)
+        self.mock_get_service.return_value = mock_service
 
         result = search_videos(query='demo video', use_query_generation=False)
 
@@ -899,9 +826,6 @@ class TestMediaSearchIntegration(unittest.TestCase):
     @patch('tools.team_tools.get_brand_context')
     def test_team_tools_search_flow(self, mock_get_brand_context, mock_get_service):
         """Test search flow for Team Companion Team Tools."""
-        from tools.team_tools import search_team_media
-        from services.media_search_service import MediaSearchResponse, MediaSearchResult
-
         mock_get_brand_context.return_value = 'team-123'
 
         mock_result = MediaSearchResponse(
@@ -918,8 +842,7 @@ class TestMediaSearchIntegration(unittest.TestCase):
             search_time_ms=28.0
         )
 
-        mock_service = MagicMock()
-        mock_service.search.return_value = mock_result
+        mock_service = _stub_service(mock_result)
         mock_get_service.return_value = mock_service
 
         result = search_team_media(
@@ -933,10 +856,9 @@ class TestMediaSearchIntegration(unittest.TestCase):
         self.assertEqual(len(result['results']), 1)
         self.assertEqual(result['results'][0]['source'], 'upload')
 
-    @patch('services.media_search_service.struct_pb2')
-    @patch('config.get_google_credentials')
-    @patch('services.media_search_service.discoveryengine')
-    def test_indexing_flow(self, mock_discoveryengine, mock_get_credentials, mock_struct_pb2):
+    @patch.object(media_search_module, 'struct_pb2')
+    @patch.object(media_search_module, 'get_google_credentials')
+    def test_indexing_flow(self, mock_get_credentials, mock_struct_pb2):
         """Test media indexing flow."""
         # Mock Google credentials
         mock_credentials = MagicMock()
@@ -946,8 +868,6 @@ class TestMediaSearchIntegration(unittest.TestCase):
         mock_struct = MagicMock()
         mock_struct_pb2.Struct.return_value = mock_struct
         
-        from services.media_search_service import MediaSearchService
-
         mock_datastore_client = MagicMock()
         mock_document_client = MagicMock()
         mock_discoveryengine.DataStoreServiceClient.return_value = mock_datastore_client
@@ -985,132 +905,54 @@ class TestSearchFilterScenarios(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures."""
-        self.env_patcher = patch.dict(os.environ, {
-            'MOMENTUM_NEXT_PUBLIC_FIREBASE_PROJECT_ID': 'test-project'
-        })
-        self.env_patcher.start()
         # Reset query generation agent singleton for test isolation
-        try:
-            from agents.query_generation_agent import reset_query_generation_agent
-            reset_query_generation_agent()
-        except ImportError:
-            pass
+        _reset_query_generation_agent()
+
+        # Every test searches brand-123 with the default settings and no results
+        self.mock_service = _stub_service(MediaSearchResponse(
+            results=[], total_count=0, query='test', search_time_ms=10.0
+        ))
+        self._stack = contextlib.ExitStack()
+        self._stack.enter_context(
+            patch('tools.media_search_tools.get_brand_context', return_value='brand-123'))
+        self._stack.enter_context(
+            patch('services.media_search_service.get_media_search_service', return_value=self.mock_service))
+        self._stack.enter_context(
+            patch('services.search_settings_service.get_search_settings_service',
+                  return_value=_settings_service_mock()))
 
     def tearDown(self):
         """Clean up after tests."""
-        self.env_patcher.stop()
+        self._stack.close()
         # Reset query generation agent singleton after test
-        try:
-            from agents.query_generation_agent import reset_query_generation_agent
-            reset_query_generation_agent()
-        except ImportError:
-            pass
+        _reset_query_generation_agent()
 
-    @patch('services.search_settings_service.get_search_settings_service')
-    @patch('services.media_search_service.get_media_search_service')
-    @patch('tools.media_search_tools.get_brand_context')
-    def test_search_with_tags_filter(self, mock_get_brand_context, mock_get_service, mock_get_settings_service):
+    def test_search_with_tags_filter(self):
         """Test searching with tags filter."""
-        from tools.media_search_tools import search_media_library
-        from services.media_search_service import MediaSearchResponse
-
-        mock_get_brand_context.return_value = 'brand-123'
-        mock_service = MagicMock()
-        mock_service.search.return_value = MediaSearchResponse(
-            results=[], total_count=0, query='test', search_time_ms=10.0
-        )
-        mock_get_service.return_value = mock_service
-        
-        # Mock search settings service to return proper SearchSettings
-        from models.search_settings import SearchSettings, SearchMethod
-        mock_settings_service = MagicMock()
-        mock_settings = SearchSettings(
-            brand_id='brand-123',
-            search_method=SearchMethod.VERTEX_AI,
-            auto_index=True,
-            vertex_ai_enabled=True
-        )
-        mock_settings_service.get_search_settings.return_value = mock_settings
-        mock_get_settings_service.return_value = mock_settings_service
-
         search_media_library(query='test', tags='summer, beach, vacation', use_query_generation=False)
 
-        if mock_service.search.called:
-            call_args = mock_service.search.call_args
+        if self.mock_service.search.called:
+            call_args = self.mock_service.search.call_args
             self.assertEqual(call_args[1]['tags'], ['summer', 'beach', 'vacation'])
 
-    @patch('services.search_settings_service.get_search_settings_service')
-    @patch('services.media_search_service.get_media_search_service')
-    @patch('tools.media_search_tools.get_brand_context')
-    def test_search_with_collections_filter(self, mock_get_brand_context, mock_get_service, mock_get_settings_service):
+    def test_search_with_collections_filter(self):
         """Test searching with collections filter."""
-        from tools.media_search_tools import search_media_library
-        from services.media_search_service import MediaSearchResponse
-
-        mock_get_brand_context.return_value = 'brand-123'
-        mock_service = MagicMock()
-        mock_service.search.return_value = MediaSearchResponse(
-            results=[], total_count=0, query='test', search_time_ms=10.0
-        )
-        mock_get_service.return_value = mock_service
-        
-        # Mock search settings service to return proper SearchSettings
-        from models.search_settings import SearchSettings, SearchMethod
-        mock_settings_service = MagicMock()
-        mock_settings = SearchSettings(
-            brand_id='brand-123',
-            search_method=SearchMethod.VERTEX_AI,
-            auto_index=True,
-            vertex_ai_enabled=True
-        )
-        mock_settings_service.get_search_settings.return_value = mock_settings
-        mock_get_settings_service.return_value = mock_settings_service
-
         search_media_library(query='test', collections='campaign-2024, product-launch', use_query_generation=False)
 
-        if mock_service.search.called:
-            call_args = mock_service.search.call_args
+        if self.mock_service.search.called:
+            call_args = self.mock_service.search.call_args
             self.assertEqual(call_args[1]['collections'], ['campaign-2024', 'product-launch'])
 
-    @patch('services.search_settings_service.get_search_settings_service')
-    @patch('services.media_search_service.get_media_search_service')
-    @patch('tools.media_search_tools.get_brand_context')
-    def test_search_limit_validation(self, mock_get_brand_context, mock_get_service, mock_get_settings_service):
+    def test_search_limit_validation(self):
         """Test that search limit is properly validated."""
-        from tools.media_search_tools import search_media_library
-        from services.media_search_service import MediaSearchResponse
-
-        mock_get_brand_context.return_value = 'brand-123'
-        mock_service = MagicMock()
-        mock_service.search.return_value = MediaSearchResponse(
-            results=[], total_count=0, query='test', search_time_ms=10.0
-        )
-        mock_get_service.return_value = mock_service
-        
-        # Mock search settings service to return proper SearchSettings
-        from models.search_settings import SearchSettings, SearchMethod
-        mock_settings_service = MagicMock()
-        mock_settings = SearchSettings(
-            brand_id='brand-123',
-            search_method=SearchMethod.VERTEX_AI,
-            auto_index=True,
-            vertex_ai_enabled=True
-        )
-        mock_settings_service.get_search_settings.return_value = mock_settings
-        mock_get_settings_service.return_value = mock_settings_service
-
         # Test limit too high
         search_media_library(query='test', limit=100, use_query_generation=False)
-        if mock_service.search.called:
-            call_args = mock_service.search.call_args
+        if self.mock_service.search.called:
+            call_args = self.mock_service.search.call_args
             self.assertEqual(call_args[1]['page_size'], 50)  # Should be capped at 50
 
         # Test limit too low
         search_media_library(query='test', limit=0, use_query_generation=False)
-        if mock_service.search.called:
-            call_args = mock_service.search.call_args
+        if self.mock_service.search.called:
+            call_args = self.mock_service.search.call_args
             self.assertEqual(call_args[1]['page_size'], 1)  # Should be at least 1
-
-
-if __name__ == '__main__':
-    unittest.main()
@@ -0,0 +1,347 @@
+"""
+Tests for Nano Banana Image Editing (nano_banana)
+
+Covers text-only generation, base64/URL/data URI inputs, reference
+images, mask-based editing, modes, aspect ratios, error handling and
+Firebase Storage URL handling. Shared media_tools fixtures (mock_genai,
+mock_upload, fake_requests) come from conftest.py.
+"""
+from unittest.mock import MagicMock, patch, DEFAULT
+import pytest
+import base64
+from types import SimpleNamespace
+
+from tools import media_tools as mt
+from tools.media_tools import nano_banana
+from _mock_fixtures import make_nano_banana_response
+
+# Base64 payloads used as image inputs, encoded once at import
+FAKE_IMG_B64 = base64.b64encode(b"fake_image_data").decode('utf-8')
+FAKE_MASK_B64 = base64.b64encode(b"mask").decode('utf-8')
+FAKE_REF_B64 = base64.b64encode(b"ref_image").decode('utf-8')
+FAKE_REF_B64S = tuple(base64.b64encode(f"ref{i}".encode()).decode('utf-8') for i in range(20))
+FAKE_DATA_URI = f"data:image/png;base64,{FAKE_IMG_B64}"
+
+NANO_ASPECT_RATIOS = ['1:1', '16:9', '9:16', '4:3', '3:2']
+
+
+EDIT_RESPONSE = make_nano_banana_response(b"edited_image_data")
+
+
+@pytest.fixture
+def edit_response(mock_genai):
+    """Set up the mock Nano Banana response"""
+    mock_genai.models.generate_content.return_value = EDIT_RESPONSE
+    return EDIT_RESPONSE
+
+
+# -------------------------------------------------------------------------
+# Basic Editing Tests
+# -------------------------------------------------------------------------
+
+def test_text_only_generation(mock_genai, mock_upload, edit_response):
+    """Test generation with only text prompt (no image)"""
+    mock_upload.return_value = "https://storage.example.com/edited.png"
+
+    result = nano_banana(prompt="Generate a sunset scene")
+
+    assert result['status'] == 'success'
+    assert 'image_url' in result
+    mock_genai.models.generate_content.assert_called_once()
+
+
+def test_image_editing_with_base64(mock_upload, edit_response):
+    """Test image editing with base64 input"""
+    mock_upload.return_value = "https://storage.example.com/edited.png"
+
+    result = nano_banana(
+        prompt="Make the sky blue",
+        image_url=FAKE_IMG_B64
+    )
+
+    assert result['status'] == 'success'
+    assert 'image_url' in result
+    assert 'image_urls' in result
+
+
+def test_image_editing_with_url(mock_upload, fake_requests, edit_response):
+    """Test image editing with URL input"""
+    mock_upload.return_value = "https://storage.example.com/edited.png"
+
+    # Mock image download
+    mock_response = MagicMock()
+    mock_response.content = b"downloaded_image"
+    mock_response.headers = {'Content-Type': 'image/png'}
+    fake_requests.get.return_value = mock_response
+
+    result = nano_banana(
+        prompt="Make it brighter",
+        image_url="https://example.com/image.png"
+    )
+
+    assert result['status'] == 'success'
+    fake_requests.get.assert_called_once()
+
+
+def test_image_editing_with_data_uri(mock_upload, edit_response):
+    """Test image editing with data URI input"""
+    mock_upload.return_value = "https://storage.example.com/edited.png"
+
+    result = nano_banana(
+        prompt="Add contrast",
+        image_url=FAKE_DATA_URI
+    )
+
+    assert result['status'] == 'success'
+
+
+def test_base64_fallback_response(mock_upload, edit_response):
+    """Test base64 fallback when upload fails"""
+    mock_upload.return_value = ""  # Upload fails
+
+    result = nano_banana(prompt="Test")
+
+    assert result['status'] == 'success'
+    assert result['format'] == 'base64'
+    assert 'image_data' in result
+    assert 'image_data_list' in result
+
+
+# -------------------------------------------------------------------------
+# Reference Images Tests
+# -------------------------------------------------------------------------
+
+def test_single_reference_image(mock_upload, edit_response):
+    """Test with single reference image"""
+    mock_upload.return_value = "https://storage.example.com/composed.png"
+
+    result = nano_banana(
+        prompt="Use this as reference",
+        reference_images=FAKE_REF_B64
+    )
+
+    assert result['status'] == 'success'
+
+
+def test_multiple_reference_images(mock_genai, mock_upload, edit_response):
+    """Test multi-image composition with comma-separated reference images"""
+    gc = mock_genai.models.generate_content
+    mock_upload.return_value = "https://storage.example.com/composed.png"
+
+    # Comma-separated reference images (ADK format)
+    result = nano_banana(
+        prompt="Combine these elements",
+        reference_images=",".join(FAKE_REF_B64S[:3])
+    )
+
+    assert result['status'] == 'success'
+
+    # Verify multiple parts were passed (prompt + 3 images)
+    contents = gc.call_args.kwargs['contents']
+    assert len(contents) > 1  # More than just prompt
+
+
+def test_max_14_reference_images(mock_upload, edit_response):
+    """Test that only up to 14 reference images are used"""
+    mock_upload.return_value = "https://storage.example.com/composed.png"
+
+    # 20 reference images (should only use 14)
+    result = nano_banana(
+        prompt="Combine all",
+        reference_images=",".join(FAKE_REF_B64S)
+    )
+
+    assert result['status'] == 'success'
+    # The function should limit to 14 images
+
+
+def test_skipped_unavailable_references(mock_upload, fake_requests, edit_response):
+    """Test that unavailable reference images are skipped and reported"""
+    mock_upload.return_value = "https://storage.example.com/composed.png"
+
+    # First URL succeeds, second fails
+    responses = {
+        "https://good.com/img.png": SimpleNamespace(
+            content=b"image",
+            headers={'Content-Type': 'image/png'},
+            raise_for_status=lambda: None
+        )
+    }
+
+    def side_effect(url, **kwargs):
+        try:
+            return responses[url]
+        except KeyError:
+            raise Exception("Download failed")
+
+    fake_requests.get.side_effect = side_effect
+
+    result = nano_banana(
+        prompt="Combine",
+        reference_images="https://good.com/img.png,https://bad.com/img.png"
+    )
+
+    assert result['status'] == 'success'
+    # Should report only the failed reference as skipped
+    assert result['skipped_references'] == ["https://bad.com/img.png"]
+
+
+# -------------------------------------------------------------------------
+# Mask-Based Editing Tests
+# -------------------------------------------------------------------------
+
+def test_mask_based_editing(mock_genai, mock_upload, edit_response):
+    """Test mask-based inpainting"""
+    gc = mock_genai.models.generate_content
+    mock_upload.return_value = "https://storage.example.com/edited.png"
+
+    result = nano_banana(
+        prompt="Replace the masked area with a tree",
+        image_url=FAKE_IMG_B64,
+        mask_url=FAKE_MASK_B64
+    )
+
+    assert result['status'] == 'success'
+
+    # Verify mask was included
+    contents = gc.call_args.kwargs['contents']
+    assert len(contents) > 2  # image + mask + prompt
+
+
+# -------------------------------------------------------------------------
+# Mode Parameter Tests
+# -------------------------------------------------------------------------
+
+def test_edit_mode(mock_upload, edit_response):
+    """Test edit mode parameter"""
+    mock_upload.return_value = "https://storage.example.com/edited.png"
+
+    result = nano_banana(
+        prompt="Enhance this",
+        image_url=FAKE_IMG_B64,
+        mode="edit"
+    )
+
+    assert result['status'] == 'success'
+
+
+def test_compose_mode(mock_upload, edit_response):
+    """Test compose mode parameter"""
+    mock_upload.return_value = "https://storage.example.com/composed.png"
+
+    result = nano_banana(
+        prompt="Compose these",
+        reference_images=",".join(FAKE_REF_B64S[:2]),
+        mode="compose"
+    )
+
+    assert result['status'] == 'success'
+
+
+# -------------------------------------------------------------------------
+# Aspect Ratio Tests
+# -------------------------------------------------------------------------
+
+@pytest.mark.parametrize('ratio', NANO_ASPECT_RATIOS)
+def test_aspect_ratios(mock_genai, mock_upload, edit_response, ratio):
+    """Test aspect ratio parameter"""
+    mock_upload.return_value = "https://storage.example.com/edited.png"
+
+    result = nano_banana(
+        prompt="Generate",
+        aspect_ratio=ratio
+    )
+    assert result['status'] == 'success'
+    mock_genai.models.generate_content.assert_called_once()
+
+
+# -------------------------------------------------------------------------
+# Advanced Parameters Tests
+# -------------------------------------------------------------------------
+
+def test_nano_person_generation(mock_upload, edit_response):
+    """Test person generation parameter"""
+    mock_upload.return_value = "https://storage.example.com/edited.png"
+
+    result = nano_banana(
+        prompt="Add a person",
+        person_generation="allow_all"
+    )
+
+    assert result['status'] == 'success'
+
+
+def test_nano_all_parameters_combined(mock_upload, edit_response):
+    """Test all Nano Banana parameters combined"""
+    mock_upload.return_value = "https://storage.example.com/edited.png"
+
+    result = nano_banana(
+        prompt="Edit with all parameters",
+        image_url=FAKE_IMG_B64,
+        reference_images=FAKE_REF_B64,
+        mode="edit",
+        aspect_ratio="16:9",
+        number_of_images=1,
+        person_generation="allow_all"
+    )
+
+    assert result['status'] == 'success'
+
+
+# -------------------------------------------------------------------------
+# Error Handling Tests
+# -------------------------------------------------------------------------
+
+def test_nano_no_client_error(monkeypatch):
+    """Test error when client not initialized"""
+    monkeypatch.setattr(mt, 'genai_client', None)
+
+    result = nano_banana(prompt="Test")
+
+    assert result['status'] == 'error'
+    assert 'not initialized' in result['error']
+
+
+def test_no_edited_image_error(mock_genai):
+    """Test error when no image is generated"""
+    mock_genai.models.generate_content.return_value = SimpleNamespace(candidates=[])
+
+    result = nano_banana(prompt="Test")
+
+    assert result['status'] == 'error'
+    assert 'No edited image' in result['error']
+
+
+def test_invalid_filename_detection(mock_upload, edit_response):
+    """Test that filenames (not URLs) are detected and rejected"""
+    mock_upload.return_value = "https://storage.example.com/edited.png"
+
+    # This should fail - looks like a filename
+    result = nano_banana(
+        prompt="Edit",
+        image_url="image.png"  # Common LLM mistake
+    )
+
+    assert result['status'] == 'error'
+    assert 'filename' in result['error'].lower()
+
+
+# -------------------------------------------------------------------------
+# Firebase Storage URL Handling Tests
+# -------------------------------------------------------------------------
+
+@patch.multiple(mt, download_from_firebase_storage=DEFAULT, is_firebase_storage_url=DEFAULT)
+def test_firebase_storage_url_handling(mock_upload, edit_response, **mocks):
+    """Test Firebase Storage URL is handled correctly"""
+    mock_download = mocks['download_from_firebase_storage']
+    mocks['is_firebase_storage_url'].return_value = True
+    mock_download.return_value = (b"firebase_image", "image/png")
+    mock_upload.return_value = "https://storage.example.com/edited.png"
+
+    result = nano_banana(
+        prompt="Edit",
+        image_url="https://firebasestorage.googleapis.com/v0/b/test/image.png"
+    )
+
+    assert result['status'] == 'success'
+    mock_download.assert_called_once()